@@ -0,0 +1,179 @@
+import argparse
+import itertools
+import json
+import pathlib
+import sys
+
+from benchmark import get_board, get_config_path, make_puzzle
+from src import compiled_board, perf, solver
+from src.board import Board
+from src.common import Direction
+from src.utils import setup_logging
+
+BENCHMARK_DIR = pathlib.Path(__file__).parent / "benchmarks"
+CORPUS_PATH = BENCHMARK_DIR / "corpus.json"
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+
+def micro_benchmarks(repeat: int) -> dict[str, perf.Summary]:
+    """Per-call times of the hot paths the game and the solver build on"""
+    puzzle = make_puzzle(0)
+    board = puzzle.board
+    robots = puzzle.robots
+    moves = itertools.cycle(itertools.product(robots, Direction))
+
+    def move_robot() -> None:
+        robot, direction = next(moves)
+        robot.move(direction, board, puzzle.occupancy)
+
+    container = solver.RobotContainer(robots)
+    state = container.get_state()
+    config_path = get_config_path()
+
+    def construct_board() -> None:
+        # Forget the boards this process compiled, so every call loads the
+        # board from the on-disk cache like a new process would
+        compiled_board._compiled_boards.clear()
+        Board(config_path=config_path)
+
+    results = {
+        "micro/robot_move": perf.measure(
+            move_robot, repeat, number=10_000, setup=puzzle.reset_robots
+        ),
+        "micro/get_state": perf.measure(container.get_state, repeat, number=10_000),
+        "micro/apply_state": perf.measure(
+            lambda: container.apply_state(state), repeat, number=10_000
+        ),
+        "micro/board_construction": perf.measure(construct_board, repeat, number=5),
+    }
+    return {name: perf.summarize(samples) for name, samples in results.items()}
+
+
+def time_solve(
+    seed: int, mode: solver.SearchMode, repeat: int
+) -> tuple[list[float], solver.Solution]:
+    """Solve time samples of seed's puzzle and the last Solution found"""
+    puzzle = make_puzzle(seed)
+    solutions: list[solver.Solution] = []
+    samples = perf.measure(
+        lambda: solutions.append(solver.Solver(puzzle, mode=mode).solve()), repeat
+    )
+    return samples, solutions[-1]
+
+
+def macro_benchmarks(
+    corpus: list[dict[str, int]], mode: solver.SearchMode, repeat: int
+) -> tuple[dict[str, perf.Summary], list[str]]:
+    """
+    Solve times of every corpus seed, plus errors for seeds whose solution
+    length differs from the one recorded in the corpus
+    """
+    get_board()  # Keep board loading out of the first seed's time
+    results: dict[str, perf.Summary] = {}
+    errors: list[str] = []
+    for entry in corpus:
+        seed, expected = entry["seed"], entry["moves"]
+        samples, solution = time_solve(seed, mode, repeat)
+        summary = perf.summarize(samples)
+        results[f"solve/{mode.value}/seed_{seed}"] = summary
+        if not solution.solved:
+            errors.append(
+                f"seed {seed}: expected {expected} moves, {solution.status.value}"
+            )
+        elif len(solution.moves) != expected:
+            errors.append(
+                f"seed {seed}: expected {expected} moves, found {len(solution.moves)}"
+            )
+        print(
+            f"Seed {seed}: {expected} moves in {perf.format_seconds(summary['median'])}"
+        )
+    return results, errors
+
+
+if __name__ == "__main__":
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Ricochet Robots benchmark suite with baseline comparison"
+    )
+    parser.add_argument(
+        "--suite",
+        choices=["all", "micro", "macro"],
+        default="all",
+        help="Which benchmarks to run",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in solver.SearchMode],
+        default=solver.SearchMode.BFS.value,
+        help="Search algorithm used by the macro benchmarks",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=None,
+        help="Samples per benchmark (default 15 micro, 3 macro)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        default=BASELINE_PATH,
+        help="Baseline JSON file to compare against or save to",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Save this run as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fail when a median is this much slower than the baseline's (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        help="Also write this run's results to a JSON file",
+    )
+    args = parser.parse_args()
+    mode = solver.SearchMode(args.mode)
+
+    results: dict[str, perf.Summary] = {}
+    errors: list[str] = []
+    if args.suite in ("all", "micro"):
+        results |= micro_benchmarks(args.repeat or 15)
+    if args.suite in ("all", "macro"):
+        corpus = json.loads(CORPUS_PATH.read_text())["seeds"]
+        macro_results, errors = macro_benchmarks(corpus, mode, args.repeat or 3)
+        results |= macro_results
+
+    print()
+    print(perf.format_results(results))
+    if args.output:
+        perf.save_results(args.output, results, mode=mode.value)
+
+    for error in errors:
+        print(f"WRONG SOLUTION: {error}")
+
+    if args.save:
+        if errors:
+            sys.exit("Not saving a baseline with wrong solutions")
+        perf.save_results(args.baseline, results, mode=mode.value)
+        print(f"\nSaved baseline to {args.baseline}")
+        sys.exit(0)
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one")
+        sys.exit(1 if errors else 0)
+
+    changes, regressions = perf.compare(
+        perf.load_results(args.baseline), results, args.threshold
+    )
+    print(f"\nCompared with {args.baseline}:")
+    print(perf.format_comparison(changes, args.threshold))
+    if regressions or errors:
+        print(
+            f"\n{len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold:.0%}, {len(errors)} wrong solution(s)"
+        )
+        sys.exit(1)
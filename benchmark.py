@@ -1,10 +1,22 @@
 import argparse
+import contextlib
+import functools
+import itertools
+import json
 import pathlib
-import random
 import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 
 import src.solver as solver
-from src.game import Game
+from src.board import Board
+from src.compiled_board import default_cache_dir
+from src.mining import mine
+from src.puzzle import Puzzle
+from src.scenario import Scenario
+from src.solution_cache import SolutionCache
+from src.stats import SearchStats
 from src.utils import setup_logging
 
 
@@ -18,6 +30,54 @@ def get_config_path() -> pathlib.Path:
         return pathlib.Path("./board.yaml")
 
 
+@functools.cache
+def get_board() -> Board:
+    """The board shared by every puzzle solved in this process"""
+    return Board(config_path=get_config_path())
+
+
+@functools.cache
+def get_solution_cache(path: pathlib.Path) -> SolutionCache:
+    """The solution cache opened by this process for path"""
+    return SolutionCache(path)
+
+
+def make_puzzle(seed: int) -> Puzzle:
+    board = get_board()
+    return Puzzle(board=board, scenario=Scenario.from_seed(board, seed))
+
+
+SeedResult = tuple[int, list[solver.Move], float, SearchStats | None]
+"""(seed, moves, solve time in seconds, search statistics unless cached)"""
+
+
+def solve_seed(
+    seed: int, mode: solver.SearchMode, cache_path: pathlib.Path | None = None
+) -> SeedResult:
+    """Builds the puzzle for seed and solves it"""
+    puzzle = make_puzzle(seed)
+    cache = get_solution_cache(cache_path) if cache_path else None
+    solver_instance = solver.Solver(puzzle, mode=mode, cache=cache)
+    start = time.perf_counter()
+    solution = solver_instance.solve()
+    return seed, solution.moves, time.perf_counter() - start, solution.stats
+
+
+def sweep_seeds(
+    seeds: range,
+    mode: solver.SearchMode,
+    workers: int,
+    cache_path: pathlib.Path | None = None,
+) -> Iterator[SeedResult]:
+    """Solves every seed, sharded across worker processes, yielding in seed order"""
+    args = (seeds, itertools.repeat(mode), itertools.repeat(cache_path))
+    if workers <= 1:
+        yield from map(solve_seed, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(solve_seed, *args)
+
+
 if __name__ == "__main__":
     setup_logging()
     parser = argparse.ArgumentParser(description="Ricochet Robots Benchmark")
@@ -33,21 +93,64 @@ if __name__ == "__main__":
         default=10,
         help="End seed for the benchmark",
     )
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in solver.SearchMode],
+        default=solver.SearchMode.BFS.value,
+        help="Search algorithm used by the solver",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes to shard the seeds across",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        type=pathlib.Path,
+        const=default_cache_dir() / "solutions.sqlite",
+        help="Reuse solutions from a SQLite solution cache (default location if "
+        "no path is given)",
+    )
+    parser.add_argument(
+        "--json",
+        type=pathlib.Path,
+        help="Write one JSON line of search statistics per seed to this file",
+    )
+    parser.add_argument(
+        "--mine",
+        type=pathlib.Path,
+        help="Mine the seeds for hard puzzles, appending them to this JSONL file "
+        "(resumes after the last checkpoint if it exists)",
+    )
+    parser.add_argument(
+        "--minMoves",
+        type=int,
+        default=10,
+        help="Shortest optimal solution a mined puzzle may have",
+    )
+    parser.add_argument(
+        "--timeLimit",
+        type=float,
+        default=None,
+        help="Seconds a mined puzzle may be solved for",
+    )
     parser.add_argument(
         "--profile",
         action="store_true",
         help="Enable profiling for the solver",
     )
     args = parser.parse_args()
+    mode = solver.SearchMode(args.mode)
 
     if args.profile:
         import cProfile
         import pstats
 
         print(f"Profiling solver with seed {args.startSeed}...")
-        random.seed(args.startSeed)
-        game = Game(config_path=get_config_path())
-        solver_instance = solver.Solver(game)
+        puzzle = make_puzzle(args.startSeed)
+        solver_instance = solver.Solver(puzzle, mode=mode)
 
         profiler = cProfile.Profile()
         profiler.enable()
@@ -59,21 +162,54 @@ if __name__ == "__main__":
         stats.print_stats()
         sys.exit(0)
 
+    if args.mine:
+        seeds = range(args.startSeed, args.endSeed + 1)
+        found = 0
+        for record in mine(
+            get_config_path(),
+            args.mine,
+            seeds,
+            args.minMoves,
+            mode,
+            args.workers,
+            args.timeLimit,
+        ):
+            found += 1
+            length = record["optimal_moves"] or f">={record['min_moves']}"
+            print(
+                f"Seed {record['seed']} {record['target']}: {length} moves "
+                f"in {record['solve_time']:.3f}s"
+            )
+        print(f"Mined {found} puzzles with at least {args.minMoves} moves")
+        sys.exit(0)
+
     longest_solution = []
     longest_solution_seed = -1
 
-    for seed in range(args.startSeed, args.endSeed + 1):
-        print(f"Solving for seed {seed}...")
-        random.seed(seed)
-        game = Game(config_path=get_config_path())
-        solver_instance = solver.Solver(game)
-        solution = solver_instance.solve()
+    sweep_start = time.perf_counter()
+    seeds = range(args.startSeed, args.endSeed + 1)
+    with contextlib.ExitStack() as stack:
+        json_file = stack.enter_context(open(args.json, "w")) if args.json else None
+        results = sweep_seeds(seeds, mode, args.workers, args.cache)
+        for seed, moves, elapsed, stats in results:
+            print(f"Seed {seed}: {len(moves)} moves in {elapsed:.3f}s")
+            if json_file is not None:
+                record = {
+                    "seed": seed,
+                    "mode": mode.value,
+                    "moves": len(moves),
+                    "elapsed": round(elapsed, 6),
+                    "stats": None if stats is None else stats.to_dict(),
+                }
+                json_file.write(json.dumps(record) + "\n")
+                json_file.flush()
 
-        if len(solution.moves) > len(longest_solution):
-            longest_solution = solution.moves
-            longest_solution_seed = seed
+            if len(moves) > len(longest_solution):
+                longest_solution = moves
+                longest_solution_seed = seed
 
     print("\n--- Benchmark Complete ---")
+    print(f"Solved {len(seeds)} seeds in {time.perf_counter() - sweep_start:.2f}s")
     print(f"Longest solution found with seed: {longest_solution_seed}")
     print(f"Number of moves: {len(longest_solution)}")
     print(f"Solution: {longest_solution}")
@@ -1,20 +1,21 @@
 import argparse
+import multiprocessing
 import pathlib
 import random
 
 import pygame
 
-import src.solver as solver
 from src.game import Game
 from src.utils import setup_logging
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # The background solver in a bundle
     setup_logging()
     parser = argparse.ArgumentParser(description="Ricochet Robots Demo")
     parser.add_argument(
         "--solve",
         action="store_true",
-        help="Solve the board instead of running the game loop",
+        help="Print the solution once the background solver finds it",
     )
     parser.add_argument(
         "--seed",
@@ -22,19 +23,30 @@ if __name__ == "__main__":
         default=None,
         help="Random seed to control randomization",
     )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=60,
+        help="Frame rate cap, 0 for uncapped",
+    )
+    parser.add_argument(
+        "--no-idle",
+        action="store_true",
+        help="Redraw every frame instead of sleeping until something changes",
+    )
     args = parser.parse_args()
     if args.seed is not None:
         random.seed(args.seed)
     else:
         random.seed(10)
     pygame.init()
-    game = Game(config_path=pathlib.Path("./board.yaml"))
+    game = Game(
+        config_path=pathlib.Path("./board.yaml"),
+        print_solution=args.solve,
+        max_fps=args.fps,
+        idle=not args.no_idle,
+    )
     if args.solve:
         print(f"Solving the board... (seed={args.seed})")
-        solver_instance = solver.Solver(game)
-        solution = solver_instance.solve()
-        print("Solution found:", solution)
-        game.run()
-    else:
-        game.run()
+    game.run()
     pygame.quit()
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import pathlib
+
+from benchmark import get_board
+from src.service import SolverService
+from src.solver import SearchMode
+from src.utils import setup_logging
+
+
+async def serve(args: argparse.Namespace) -> None:
+    service = SolverService(
+        get_board(),
+        workers=args.workers,
+        mode=SearchMode(args.mode),
+        time_limit=args.timeLimit,
+        cache_size=args.cacheSize,
+    )
+    try:
+        if args.socket:
+            server = await service.start_unix_server(str(args.socket))
+        else:
+            server = await service.start_server(args.host, args.port)
+        print(f"Serving on {server.sockets[0].getsockname()}")
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Ricochet Robots solver service (JSON lines over a socket)"
+    )
+    parser.add_argument(
+        "--socket", type=pathlib.Path, help="Listen on this Unix socket"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Host to listen on without --socket"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="Port to listen on without --socket"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Solver processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in SearchMode],
+        default=SearchMode.IDA_STAR.value,
+        help="Search algorithm",
+    )
+    parser.add_argument(
+        "--timeLimit",
+        type=float,
+        default=30.0,
+        help="Seconds a search may take before it answers TIME_LIMIT",
+    )
+    parser.add_argument(
+        "--cacheSize",
+        type=int,
+        default=10_000,
+        help="Solved puzzles kept in memory",
+    )
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,121 @@
+import functools
+import logging
+import multiprocessing
+import pathlib
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.sharedctypes import Synchronized
+
+from .board import Board
+from .puzzle import Puzzle
+from .scenario import Scenario
+from .solver import SearchMode, Solution, Solver
+
+# Id of the newest request, shared with the worker process
+_latest_request: Synchronized | None = None
+
+
+class _Superseded:
+    """CancelToken that is set once a newer request has been submitted"""
+
+    def __init__(self, request_id: int) -> None:
+        self.request_id = request_id
+
+    def is_set(self) -> bool:
+        assert _latest_request is not None
+        return _latest_request.value != self.request_id
+
+
+def _init_worker(latest_request: Synchronized) -> None:
+    global _latest_request
+    _latest_request = latest_request
+
+
+@functools.cache
+def _get_board(config_path: pathlib.Path) -> Board:
+    return Board(config_path=config_path)
+
+
+def _solve(
+    config_path: pathlib.Path,
+    scenario: Scenario,
+    mode: SearchMode,
+    time_limit: float | None,
+    request_id: int,
+) -> Solution:
+    puzzle = Puzzle(board=_get_board(config_path), scenario=scenario)
+    return Solver(puzzle, mode=mode).solve(
+        time_limit=time_limit, cancel=_Superseded(request_id)
+    )
+
+
+class BackgroundSolver:
+    """
+    Solves puzzles in a worker process so that a long search never blocks the
+    caller, which polls for results instead. Only the newest request matters:
+    submitting one cancels the search of any older request, and results of
+    older requests are never returned.
+    """
+
+    def __init__(
+        self,
+        config_path: pathlib.Path,
+        mode: SearchMode = SearchMode.BFS,
+        time_limit: float | None = 60.0,
+    ) -> None:
+        self.config_path = config_path
+        self.mode = mode
+        self.time_limit = time_limit
+        # spawn rather than fork: the parent has pygame and executor threads
+        context = multiprocessing.get_context("spawn")
+        self._latest_request: Synchronized = context.Value("q", 0)
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._latest_request,),
+        )
+        self._results: queue.SimpleQueue[tuple[int, Solution]] = queue.SimpleQueue()
+        self.request_id = 0
+        self._answered_request = 0
+
+    @property
+    def pending(self) -> bool:
+        """Whether the newest request has not been answered yet"""
+        return self._answered_request != self.request_id
+
+    def submit(self, scenario: Scenario) -> None:
+        """Starts solving scenario, superseding any earlier request"""
+        self.request_id += 1
+        request_id = self.request_id
+        self._latest_request.value = request_id
+        future = self._executor.submit(
+            _solve, self.config_path, scenario, self.mode, self.time_limit, request_id
+        )
+        future.add_done_callback(functools.partial(self._on_done, request_id))
+
+    def poll(self) -> Solution | None:
+        """Returns the Solution of the newest request once it is available"""
+        solution = None
+        while True:
+            try:
+                request_id, result = self._results.get_nowait()
+            except queue.Empty:
+                return solution
+            if request_id == self.request_id:
+                self._answered_request = request_id
+                solution = result
+
+    def close(self) -> None:
+        self._latest_request.value = -1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, request_id: int, future: Future[Solution]) -> None:
+        """Runs on an executor thread, so it only hands the result over"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Background solve {request_id} failed: {error!r}")
+            return
+        self._results.put((request_id, future.result()))
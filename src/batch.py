@@ -0,0 +1,77 @@
+import itertools
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from .board_pool import BoardPool, solve_scenario
+from .kernel import MoveKernel
+from .puzzle import Puzzle
+from .scenario import Scenario
+from .solver import SearchMode, Solution
+
+
+def _current_scenario(puzzle: Puzzle) -> Scenario:
+    """The puzzle as it stands, with the robots where they are now"""
+    return Scenario(
+        puzzle.scenario.target_coords,
+        {robot.color: robot.get_position() for robot in puzzle.robots},
+        puzzle.goal_target,
+        puzzle.scenario.seed,
+    )
+
+
+def solve_many(
+    puzzles: Iterable[Puzzle],
+    workers: int | None = None,
+    mode: SearchMode = SearchMode.BFS,
+    time_limit: float | None = None,
+    max_depth: int | None = None,
+) -> Iterator[tuple[int, Solution]]:
+    """
+    Solves puzzles that share one board across worker processes (one per CPU
+    by default) and yields (index of the puzzle in puzzles, its Solution) as
+    each search finishes, so not in input order. time_limit and max_depth
+    apply to each puzzle.
+
+    The workers are a BoardPool, so a task only carries the puzzle's Scenario.
+    puzzles may be a lazy iterable: only a few tasks per worker are in flight
+    at a time.
+    """
+    puzzles = iter(puzzles)
+    first = next(puzzles, None)
+    if first is None:
+        return
+    board = first.board
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tables = board.compiled.to_bytes()
+
+    def scenarios() -> Iterator[Scenario]:
+        for puzzle in itertools.chain([first], puzzles):
+            compiled = puzzle.board.compiled
+            if compiled is not board.compiled and compiled.to_bytes() != tables:
+                raise ValueError("solve_many() needs puzzles on the same board")
+            yield _current_scenario(puzzle)
+
+    if workers <= 1:
+        kernel = MoveKernel.from_board(board)
+        for index, scenario in enumerate(scenarios()):
+            yield (
+                index,
+                solve_scenario(board, kernel, scenario, mode, time_limit, max_depth),
+            )
+        return
+
+    with BoardPool(board, workers) as pool:
+        pending: dict[Future[Solution], int] = {}
+        tasks = enumerate(scenarios())
+        while True:
+            for index, scenario in itertools.islice(tasks, 4 * workers - len(pending)):
+                future = pool.submit(scenario, mode, time_limit, max_depth)
+                pending[future] = index
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
@@ -1,19 +1,27 @@
 import pathlib
-import random
-from typing import Any  # Import Any for type hinting
 
-import pygame
-import yaml
-
-from .common import (  # Import Target, TargetShape, TARGET_SHAPES, TARGET_COLORS from common.py
-    TARGET_COLORS,
-    TARGET_SHAPES,
-    Target,
-    TargetShape,
+from .common import Direction, Target
+from .compiled_board import (
+    WALL_EAST,
+    WALL_NORTH,
+    WALL_SOUTH,
+    WALL_WEST,
+    CompiledBoard,
+    load_compiled_board,
 )
 
 
 class Cell:
+    __slots__ = (
+        "col",
+        "has_wall_east",
+        "has_wall_north",
+        "has_wall_south",
+        "has_wall_west",
+        "row",
+        "target",
+    )
+
     def __init__(self, row: int, col: int) -> None:
         self.row = row
         self.col = col
@@ -21,102 +29,148 @@ class Cell:
         self.has_wall_east = False
         self.has_wall_south = False
         self.has_wall_west = False
-        self.target = None
-
-
-def draw_target_shape(
-    screen: pygame.Surface,
-    target_shape: TargetShape,
-    target_color: tuple[int, int, int],
-    center_x: int,
-    center_y: int,
-    scale: int,
-) -> None:
-    if target_shape == TargetShape.CIRCLE:
-        pygame.draw.circle(screen, target_color, (center_x, center_y), scale // 2)
-    elif target_shape == TargetShape.SQUARE:
-        side = scale // 1.5
-        square_rect = pygame.Rect(
-            center_x - side // 2, center_y - side // 2, side, side
-        )
-        pygame.draw.rect(screen, target_color, square_rect)
-    elif target_shape == TargetShape.TRIANGLE:
-        point1 = (center_x, center_y - scale // 3)
-        point2 = (center_x - scale // 3, center_y + scale // 3)
-        point3 = (center_x + scale // 3, center_y + scale // 3)
-        pygame.draw.polygon(screen, target_color, [point1, point2, point3])
-    elif target_shape == TargetShape.ELLIPSE:
-        ellipse_rect = pygame.Rect(
-            center_x - scale // 3, center_y - scale // 4, 2 * scale // 3, 2 * scale // 4
-        )
-        pygame.draw.ellipse(screen, target_color, ellipse_rect)
+        self.target: Target | None = None
 
 
 class Board:
-    def __init__(self, config_path: pathlib.Path) -> None:
-        config = self._load_config(config_path)
-        self.width: int = config["width"]
-        self.height: int = config["height"]
+    def __init__(
+        self,
+        config_path: pathlib.Path | None = None,
+        cache_dir: pathlib.Path | None = None,
+        *,
+        compiled: CompiledBoard | None = None,
+    ) -> None:
+        """
+        The board layout is read through load_compiled_board, so board.yaml is
+        only parsed when its contents changed since the last compile.
+        cache_dir defaults to default_cache_dir(). An already compiled board
+        can be passed instead of config_path.
+        Targets are placed later with assign_targets, usually by a Scenario.
+        """
+        if compiled is None:
+            if config_path is None:
+                raise ValueError("Either config_path or compiled is required")
+            compiled = load_compiled_board(config_path, cache_dir)
+        self.compiled: CompiledBoard = compiled
+        self.width: int = compiled.width
+        self.height: int = compiled.height
+        self.robot_count: int = compiled.robot_count
         self.grid: list[list[Cell]] = self._create_empty_grid(self.width, self.height)
         self._target_lookup: dict[Target, tuple[int, int]] = {}
+        self.revision = 0
+        """Bumped whenever the drawn board changes, so renderers can cache it"""
 
-        self.grid_line_color: tuple[int, int, int] = tuple(
-            config.get("grid_line_color", [200, 200, 200])
-        )
-        self.wall_color: tuple[int, int, int] = tuple(
-            config.get("wall_color", [255, 0, 0])
-        )
-        self.show_cell_coords: bool = config.get("show_cell_coords", False)
+        self.grid_line_color: tuple[int, int, int] = compiled.grid_line_color
+        self.wall_color: tuple[int, int, int] = compiled.wall_color
+        self.show_cell_coords: bool = compiled.show_cell_coords
 
         self.buffer = 50
 
-        # Randomly assign target coordinates
-        available_coords = [tuple(coord) for coord in config["target_coordinates"]]
-        random.shuffle(available_coords)
-
-        all_targets = list(Target)  # Get all target enums
-        if len(available_coords) < len(all_targets):
-            raise ValueError("Not enough unique coordinates for all targets.")
-
-        for i, target_enum in enumerate(all_targets):
-            row, col = available_coords[i]
-            self.grid[row][col].target = target_enum
-            self._target_lookup[target_enum] = (row, col)
+        self._apply_walls(compiled.walls)
 
-        self._apply_walls(config)
+        self._ray_lookup: dict[Direction, list[list[tuple[tuple[int, int], ...]]]] = {}
+        self._stop_lookup: dict[Direction, list[list[tuple[int, int]]]] = {}
+        self._build_move_tables()
 
     def get_target_coords(self, target: Target) -> tuple[int, int]:
         """Returns (row, col) for the given target"""
         return self._target_lookup[target]
 
-    def _load_config(self, config_path: pathlib.Path) -> dict[str, Any]:
-        with open(config_path, "r") as f:
-            config: dict[str, Any] = yaml.safe_load(f)
-        return config
+    def assign_targets(self, target_coords: dict[Target, tuple[int, int]]) -> None:
+        """Places the targets on the board, replacing any previous assignment"""
+        for row, col in self._target_lookup.values():
+            self.grid[row][col].target = None
+        self._target_lookup = dict(target_coords)
+        for target, (row, col) in self._target_lookup.items():
+            self.grid[row][col].target = target
+        self.revision += 1
+
+    def get_ray(
+        self, row: int, col: int, direction: Direction
+    ) -> tuple[tuple[int, int], ...]:
+        """Returns the cells a robot at (row, col) passes through when moving in
+        direction on an empty board, ending with the cell where the walls stop it"""
+        if direction not in self._ray_lookup:
+            # Rays are only needed by a few callers, so they are built on demand
+            self._build_rays(direction)
+        return self._ray_lookup[direction][row][col]
+
+    def get_stop_coords(
+        self, row: int, col: int, direction: Direction
+    ) -> tuple[int, int]:
+        """Returns (row, col) where a robot at (row, col) moving in direction is
+        stopped by the walls, ignoring other robots"""
+        return self._stop_lookup[direction][row][col]
+
+    def can_step(self, row: int, col: int, direction: Direction) -> bool:
+        """Checks if a robot can leave (row, col) by one cell in direction"""
+        cell = self.grid[row][col]
+        if direction == Direction.UP:
+            return (
+                row > 0
+                and not cell.has_wall_north
+                and not self.grid[row - 1][col].has_wall_south
+            )
+        if direction == Direction.DOWN:
+            return (
+                row < self.height - 1
+                and not cell.has_wall_south
+                and not self.grid[row + 1][col].has_wall_north
+            )
+        if direction == Direction.LEFT:
+            return (
+                col > 0
+                and not cell.has_wall_west
+                and not self.grid[row][col - 1].has_wall_east
+            )
+        return (
+            col < self.width - 1
+            and not cell.has_wall_east
+            and not self.grid[row][col + 1].has_wall_west
+        )
 
-    def _apply_walls(self, config: dict[str, Any]) -> None:
-        # Apply outer border walls
+    def _build_move_tables(self) -> None:
+        # Expand the compiled stop cells so that robot moves become lookups
+        for direction, stop_cells in zip(Direction, self.compiled.stops):
+            self._stop_lookup[direction] = [
+                [
+                    divmod(stop_cells[r * self.width + c], self.width)
+                    for c in range(self.width)
+                ]
+                for r in range(self.height)
+            ]
+
+    def _build_rays(self, direction: Direction) -> None:
+        d_row, d_col = {
+            Direction.UP: (-1, 0),
+            Direction.DOWN: (1, 0),
+            Direction.LEFT: (0, -1),
+            Direction.RIGHT: (0, 1),
+        }[direction]
+        rays: list[list[tuple[tuple[int, int], ...]]] = []
         for r in range(self.height):
-            self.grid[r][0].has_wall_west = True
-            self.grid[r][self.width - 1].has_wall_east = True
-        for c in range(self.width):
-            self.grid[0][c].has_wall_north = True
-            self.grid[self.height - 1][c].has_wall_south = True
-
-        # Apply internal walls from config
-        walls_config = config["walls"]
-        for coord_str, wall_def in walls_config.items():
-            # Convert string key "(row, col)" to tuple (row, col)
-            row, col = map(int, coord_str.strip("()").split(","))
-            cell = self.grid[row][col]
-            if "N" in wall_def:
-                cell.has_wall_north = True
-            if "E" in wall_def:
-                cell.has_wall_east = True
-            if "S" in wall_def:
-                cell.has_wall_south = True
-            if "W" in wall_def:
-                cell.has_wall_west = True
+            ray_row: list[tuple[tuple[int, int], ...]] = []
+            for c in range(self.width):
+                stop = self._stop_lookup[direction][r][c]
+                ray: list[tuple[int, int]] = []
+                row, col = r, c
+                while (row, col) != stop:
+                    row += d_row
+                    col += d_col
+                    ray.append((row, col))
+                ray_row.append(tuple(ray))
+            rays.append(ray_row)
+        self._ray_lookup[direction] = rays
+
+    def _apply_walls(self, walls: bytes) -> None:
+        # walls holds one wall bitmask per cell, outer border included
+        for row in self.grid:
+            for cell in row:
+                mask = walls[cell.row * self.width + cell.col]
+                cell.has_wall_north = bool(mask & WALL_NORTH)
+                cell.has_wall_east = bool(mask & WALL_EAST)
+                cell.has_wall_south = bool(mask & WALL_SOUTH)
+                cell.has_wall_west = bool(mask & WALL_WEST)
 
     def _create_empty_grid(self, width: int, height: int) -> list[list[Cell]]:
         grid: list[list[Cell]] = []
@@ -127,68 +181,3 @@ class Board:
                 row.append(cell)
             grid.append(row)
         return grid
-
-    def draw(self, screen: pygame.Surface) -> None:
-        cell_width: int = (screen.get_width() - 2 * self.buffer) // self.width
-        cell_height: int = (screen.get_height() - 2 * self.buffer) // self.height
-
-        # Draw grid lines
-        for r in range(self.height):
-            for c in range(self.width):
-                x: int = self.buffer + c * cell_width
-                y: int = self.buffer + r * cell_height
-                # Draw horizontal grid line
-                pygame.draw.line(
-                    screen, self.grid_line_color, (x, y), (x + cell_width, y), 1
-                )
-                # Draw vertical grid line
-                pygame.draw.line(
-                    screen, self.grid_line_color, (x, y), (x, y + cell_height), 1
-                )
-
-        # Draw walls and targets
-        for r in range(self.height):
-            for c in range(self.width):
-                cell = self.grid[r][c]
-                x = self.buffer + c * cell_width
-                y = self.buffer + r * cell_height
-
-                if cell.has_wall_north:
-                    pygame.draw.line(
-                        screen, self.wall_color, (x, y), (x + cell_width, y), 4
-                    )
-                if cell.has_wall_east:
-                    pygame.draw.line(
-                        screen,
-                        self.wall_color,
-                        (x + cell_width, y),
-                        (x + cell_width, y + cell_height),
-                        4,
-                    )
-                if cell.has_wall_south:
-                    pygame.draw.line(
-                        screen,
-                        self.wall_color,
-                        (x, y + cell_height),
-                        (x + cell_width, y + cell_height),
-                        4,
-                    )
-                if cell.has_wall_west:
-                    pygame.draw.line(
-                        screen, self.wall_color, (x, y), (x, y + cell_height), 4
-                    )
-
-                if cell.target:
-                    shape: TargetShape | None = TARGET_SHAPES.get(cell.target)
-                    color: tuple[int, int, int] | None = TARGET_COLORS.get(cell.target)
-                    if shape and color:
-                        center_x: int = x + cell_width // 2
-                        center_y: int = y + cell_height // 2
-                        draw_target_shape(
-                            screen, shape, color, center_x, center_y, cell_width
-                        )
-
-                if self.show_cell_coords:
-                    _font = pygame.font.SysFont(None, 24)
-                    text: pygame.Surface = _font.render(f"{r},{c}", True, (0, 0, 0))
-                    screen.blit(text, (x + 5, y + 5))
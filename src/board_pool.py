@@ -0,0 +1,97 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Self
+
+from .board import Board
+from .compiled_board import CompiledBoard
+from .kernel import MoveKernel
+from .puzzle import Puzzle
+from .scenario import Scenario
+from .solver import SearchMode, Solution, Solver
+
+# This worker's board and move kernel, built once by _init_worker
+_board: Board | None = None
+_kernel: MoveKernel | None = None
+
+
+def _init_worker(shm_name: str, size: int) -> None:
+    """Builds the board from the tables the parent published in shared memory"""
+    global _board, _kernel
+    shm = shared_memory.SharedMemory(shm_name)
+    try:
+        compiled = CompiledBoard.from_bytes(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+    _board = Board(compiled=compiled)
+    _kernel = MoveKernel.from_board(_board)
+
+
+def _solve_in_worker(
+    scenario: Scenario,
+    mode: SearchMode,
+    time_limit: float | None,
+    max_depth: int | None,
+) -> Solution:
+    assert _board is not None and _kernel is not None
+    return solve_scenario(_board, _kernel, scenario, mode, time_limit, max_depth)
+
+
+def solve_scenario(
+    board: Board,
+    kernel: MoveKernel,
+    scenario: Scenario,
+    mode: SearchMode,
+    time_limit: float | None = None,
+    max_depth: int | None = None,
+) -> Solution:
+    """Solves scenario on board, reusing kernel, the MoveKernel of board"""
+    puzzle = Puzzle(board=board, scenario=scenario)
+    return Solver(puzzle, mode=mode, kernel=kernel).solve(
+        time_limit=time_limit, max_depth=max_depth
+    )
+
+
+class BoardPool:
+    """
+    Worker processes that solve scenarios on one board. The board's compiled
+    tables are published once through shared memory and every worker builds
+    its Board and MoveKernel from them when it starts, so a task only carries
+    a Scenario.
+    """
+
+    def __init__(self, board: Board, workers: int) -> None:
+        tables = board.compiled.to_bytes()
+        self._tables = shared_memory.SharedMemory(create=True, size=len(tables))
+        self._tables.buf[: len(tables)] = tables
+        # spawn rather than fork, like BackgroundSolver: workers only get the
+        # board through shared memory, and the caller may have threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._tables.name, len(tables)),
+        )
+
+    def submit(
+        self,
+        scenario: Scenario,
+        mode: SearchMode,
+        time_limit: float | None = None,
+        max_depth: int | None = None,
+    ) -> Future[Solution]:
+        return self._executor.submit(
+            _solve_in_worker, scenario, mode, time_limit, max_depth
+        )
+
+    def close(self) -> None:
+        """Cancels queued searches, waits for running ones and frees the tables"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._tables.close()
+        self._tables.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
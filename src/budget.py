@@ -0,0 +1,92 @@
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import NamedTuple, Protocol
+
+from .stats import SearchStats
+
+CHECK_INTERVAL = 1024
+"""States a search expands between two budget checks"""
+
+
+class SolveStatus(Enum):
+    SOLVED = "SOLVED"
+    UNSOLVABLE = "UNSOLVABLE"
+    TIME_LIMIT = "TIME_LIMIT"
+    DEPTH_LIMIT = "DEPTH_LIMIT"
+    NODE_LIMIT = "NODE_LIMIT"
+    CANCELLED = "CANCELLED"
+
+
+class SearchProgress(NamedTuple):
+    depth: int
+    """Number of moves of the solutions the search is now looking for"""
+    frontier_size: int
+    """States about to be expanded; IDA* has no frontier and reports 0"""
+    visited: int
+    """States in the visited set or transposition table"""
+
+
+class CancelToken(Protocol):
+    """Anything with is_set(), such as threading.Event or multiprocessing.Event"""
+
+    def is_set(self) -> bool: ...
+
+
+class BudgetExhausted(Exception):
+    def __init__(self, status: SolveStatus) -> None:
+        super().__init__(status.value)
+        self.status = status
+
+
+class SearchBudget:
+    """
+    Limits of one search: wall-clock seconds, solution depth and expanded
+    states, plus an optional CancelToken that cancels the search once set.
+    Searches call start_depth() before looking one move deeper and expand()
+    before expanding a batch of states; both raise BudgetExhausted once a limit
+    is hit, and min_moves then says how many moves a solution needs at least.
+    The budget also collects the SearchStats of the search.
+    """
+
+    def __init__(
+        self,
+        time_limit: float | None = None,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        progress: Callable[[SearchProgress], None] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> None:
+        self.deadline = None if time_limit is None else time.monotonic() + time_limit
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.progress = progress
+        self.cancel = cancel
+        self.stats = SearchStats()
+        self.min_moves = 0
+        """Every solution has at least this many moves"""
+
+    def start_depth(self, depth: int, frontier_size: int, visited: int) -> None:
+        """Called once all solutions shorter than depth moves have been ruled out"""
+        self.min_moves = depth
+        if self.progress is not None:
+            self.progress(SearchProgress(depth, frontier_size, visited))
+        if self.max_depth is not None and depth > self.max_depth:
+            raise BudgetExhausted(SolveStatus.DEPTH_LIMIT)
+        self.expand(0)
+        self.stats.start_layer(frontier_size, visited)
+
+    @property
+    def nodes(self) -> int:
+        """States expanded so far"""
+        return self.stats.nodes_expanded
+
+    def expand(self, count: int) -> None:
+        """Accounts for count states about to be expanded"""
+        if self.cancel is not None and self.cancel.is_set():
+            raise BudgetExhausted(SolveStatus.CANCELLED)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExhausted(SolveStatus.TIME_LIMIT)
+        if self.max_nodes is not None and self.nodes + count > self.max_nodes:
+            raise BudgetExhausted(SolveStatus.NODE_LIMIT)
+        self.stats.nodes_expanded += count
@@ -11,12 +11,22 @@ class RobotColor(Enum):
     BLUE = "BLUE"
     GREEN = "GREEN"
     YELLOW = "YELLOW"
+    # Extra robots for variants with more than four; they have no targets and
+    # only act as blockers
+    SILVER = "SILVER"
+    BLACK = "BLACK"
+    ORANGE = "ORANGE"
+    PURPLE = "PURPLE"
 
 ROBOT_COLORS = {
     RobotColor.RED: (255, 0, 0),
     RobotColor.BLUE: (0, 0, 255),
     RobotColor.GREEN: (0, 255, 0),
     RobotColor.YELLOW: (255, 255, 0),
+    RobotColor.SILVER: (170, 170, 170),
+    RobotColor.BLACK: (40, 40, 40),
+    RobotColor.ORANGE: (255, 140, 0),
+    RobotColor.PURPLE: (150, 0, 200),
 }
 
 class Target(Enum):
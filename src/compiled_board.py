@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import os
+import pathlib
+import struct
+from array import array
+from typing import Any
+
+from .common import TARGET_ROBOT_COLORS, RobotColor
+
+# Wall bits of a cell in CompiledBoard.walls
+WALL_NORTH = 1
+WALL_EAST = 2
+WALL_SOUTH = 4
+WALL_WEST = 8
+
+# Bump whenever the layout of the binary file changes
+FORMAT_VERSION = 2
+_MAGIC = b"RRBD"
+# magic, version, width, height, grid line RGB, wall RGB, show_cell_coords,
+# robot count, number of target coordinates
+_HEADER = struct.Struct("<4sHHH3B3BBBH")
+
+DEFAULT_ROBOT_COUNT = 4
+MIN_ROBOT_COUNT = len(set(TARGET_ROBOT_COLORS.values()))
+"""Every robot colour with targets must be on the board to be a goal robot"""
+MAX_CELLS = 1 << 16
+"""Cell indices are stored as unsigned shorts"""
+
+_compiled_boards: dict[str, "CompiledBoard"] = {}
+"""Boards already compiled or loaded by this process, keyed by content hash"""
+
+
+def default_cache_dir() -> pathlib.Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return pathlib.Path(cache_home) / "rr_demo"
+    return pathlib.Path.home() / ".cache" / "rr_demo"
+
+
+class CompiledBoard:
+    """
+    Everything Board needs from board.yaml, in flat arrays: a wall bitmask per
+    cell (row * width + col, outer border included), the candidate target
+    coordinates and, for each Direction in declaration order, the cell where the
+    walls stop a robot leaving each cell. robot_count robots play on the board,
+    the first ones in RobotColor order.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        grid_line_color: tuple[int, int, int],
+        wall_color: tuple[int, int, int],
+        show_cell_coords: bool,
+        target_coordinates: list[tuple[int, int]],
+        walls: bytes,
+        stops: list[array],
+        robot_count: int = DEFAULT_ROBOT_COUNT,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.grid_line_color = grid_line_color
+        self.wall_color = wall_color
+        self.show_cell_coords = show_cell_coords
+        self.target_coordinates = target_coordinates
+        self.walls = walls
+        self.stops = stops
+        self.robot_count = robot_count
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "CompiledBoard":
+        width: int = config["width"]
+        height: int = config["height"]
+        if width < 1 or height < 1 or width * height > MAX_CELLS:
+            raise ValueError(f"Unsupported board size {width}x{height}")
+        robot_count: int = config.get("robot_count", DEFAULT_ROBOT_COUNT)
+        _check_robot_count(robot_count)
+        walls = bytearray(width * height)
+
+        # Apply outer border walls
+        for r in range(height):
+            walls[r * width] |= WALL_WEST
+            walls[r * width + width - 1] |= WALL_EAST
+        for c in range(width):
+            walls[c] |= WALL_NORTH
+            walls[(height - 1) * width + c] |= WALL_SOUTH
+
+        # Apply internal walls from config
+        bits = {"N": WALL_NORTH, "E": WALL_EAST, "S": WALL_SOUTH, "W": WALL_WEST}
+        for coord_str, wall_def in config["walls"].items():
+            # Convert string key "(row, col)" to tuple (row, col)
+            row, col = map(int, coord_str.strip("()").split(","))
+            for side, bit in bits.items():
+                if side in wall_def:
+                    walls[row * width + col] |= bit
+
+        return cls(
+            width=width,
+            height=height,
+            grid_line_color=_color(config.get("grid_line_color", [200, 200, 200])),
+            wall_color=_color(config.get("wall_color", [255, 0, 0])),
+            show_cell_coords=config.get("show_cell_coords", False),
+            target_coordinates=[
+                (row, col) for row, col in config["target_coordinates"]
+            ],
+            walls=bytes(walls),
+            stops=_compute_stops(width, height, walls),
+            robot_count=robot_count,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialises the board; the arrays use the native byte order"""
+        header = _HEADER.pack(
+            _MAGIC,
+            FORMAT_VERSION,
+            self.width,
+            self.height,
+            *self.grid_line_color,
+            *self.wall_color,
+            self.show_cell_coords,
+            self.robot_count,
+            len(self.target_coordinates),
+        )
+        coords = array("H", [v for coord in self.target_coordinates for v in coord])
+        return b"".join(
+            [header, coords.tobytes(), self.walls]
+            + [stop_cells.tobytes() for stop_cells in self.stops]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompiledBoard":
+        (
+            magic,
+            version,
+            width,
+            height,
+            *colors,
+            show_cell_coords,
+            robot_count,
+            target_count,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a compiled board of the current format")
+        _check_robot_count(robot_count)
+        offset = _HEADER.size
+        coords = array("H")
+        coords.frombytes(data[offset : offset + 4 * target_count])
+        offset += 4 * target_count
+        cell_count = width * height
+        walls = data[offset : offset + cell_count]
+        offset += cell_count
+        stops: list[array] = []
+        for _ in range(4):
+            stop_cells = array("H")
+            stop_cells.frombytes(data[offset : offset + 2 * cell_count])
+            offset += 2 * cell_count
+            stops.append(stop_cells)
+        if len(walls) != cell_count or len(stops[-1]) != cell_count:
+            raise ValueError("Compiled board is truncated")
+        return cls(
+            width=width,
+            height=height,
+            grid_line_color=(colors[0], colors[1], colors[2]),
+            wall_color=(colors[3], colors[4], colors[5]),
+            show_cell_coords=bool(show_cell_coords),
+            target_coordinates=list(zip(coords[0::2], coords[1::2])),
+            walls=walls,
+            stops=stops,
+            robot_count=robot_count,
+        )
+
+
+def load_compiled_board(
+    config_path: pathlib.Path, cache_dir: pathlib.Path | None = None
+) -> CompiledBoard:
+    """
+    Returns the CompiledBoard for a board.yaml. The YAML is only parsed when
+    neither this process nor cache_dir has a board compiled from the same file
+    contents; a freshly compiled board is written back to cache_dir.
+    """
+    data = pathlib.Path(config_path).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    compiled = _compiled_boards.get(digest)
+    if compiled is not None:
+        return compiled
+
+    cache_file = (cache_dir or default_cache_dir()) / f"board-{digest[:32]}.bin"
+    try:
+        compiled = CompiledBoard.from_bytes(cache_file.read_bytes())
+    except (OSError, ValueError, struct.error):
+        import yaml  # Only needed when the cache is cold
+
+        compiled = CompiledBoard.from_config(yaml.safe_load(data))
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            temp_file.write_bytes(compiled.to_bytes())
+            temp_file.replace(cache_file)
+        except OSError as e:
+            logging.info(f"Could not write board cache {cache_file}: {e}")
+
+    _compiled_boards[digest] = compiled
+    return compiled
+
+
+def _check_robot_count(robot_count: int) -> None:
+    if not MIN_ROBOT_COUNT <= robot_count <= len(RobotColor):
+        raise ValueError(
+            f"robot_count must be between {MIN_ROBOT_COUNT} and {len(RobotColor)}, "
+            f"not {robot_count}"
+        )
+
+
+def _color(value: list[int]) -> tuple[int, int, int]:
+    return (value[0], value[1], value[2])
+
+
+def _compute_stops(width: int, height: int, walls: bytearray) -> list[array]:
+    # (row step, col step, wall bit leaving the cell, wall bit entering the next)
+    steps = [
+        (-1, 0, WALL_NORTH, WALL_SOUTH),  # UP
+        (1, 0, WALL_SOUTH, WALL_NORTH),  # DOWN
+        (0, -1, WALL_WEST, WALL_EAST),  # LEFT
+        (0, 1, WALL_EAST, WALL_WEST),  # RIGHT
+    ]
+    stops: list[array] = []
+    for d_row, d_col, leaving, entering in steps:
+        stop_cells = array("H")
+        for r in range(height):
+            for c in range(width):
+                row, col = r, c
+                while True:
+                    next_row, next_col = row + d_row, col + d_col
+                    if not (0 <= next_row < height and 0 <= next_col < width):
+                        break
+                    if walls[row * width + col] & leaving:
+                        break
+                    if walls[next_row * width + next_col] & entering:
+                        break
+                    row, col = next_row, next_col
+                stop_cells.append(row * width + col)
+        stops.append(stop_cells)
+    return stops
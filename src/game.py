@@ -1,25 +1,39 @@
 import logging
 import pathlib
-import random
 import time  # Import time module
 
 import pygame
 
-from .board import Board, draw_target_shape  # Import Cell for type hinting
-from .common import (  # Import Direction, RobotColor, Target, TARGET_SHAPES, ROBOT_COLORS, TARGET_ROBOT_COLORS, TARGET_COLORS from common.py
+from .background import BackgroundSolver
+from .common import (  # Import Direction, TARGET_SHAPES, ROBOT_COLORS, TARGET_COLORS from common.py
     ROBOT_COLORS,
     TARGET_COLORS,
-    TARGET_ROBOT_COLORS,
     TARGET_SHAPES,
     Direction,
-    RobotColor,
-    Target,
 )
-from .robots import Robot
-
-
-class Game:
-    def __init__(self, config_path: pathlib.Path) -> None:
+from .puzzle import Puzzle
+from .render import draw_board, draw_robot, draw_target_shape, render_text
+from .scenario import Scenario
+from .solver import Move, Solution
+
+# How long an idle game sleeps waiting for input before checking on the solver
+IDLE_TIMEOUT_MS = 1000
+IDLE_TIMEOUT_SOLVING_MS = 100
+
+
+class Game(Puzzle):
+    def __init__(
+        self,
+        config_path: pathlib.Path,
+        print_solution: bool = False,
+        max_fps: int = 60,
+        idle: bool = True,
+    ) -> None:
+        """
+        max_fps caps the frame rate, 0 leaves it uncapped. With idle the game
+        sleeps until there is input or news from the solver and only redraws
+        when something changed; otherwise it redraws every frame.
+        """
         # Screen dimensions
         self.SCREEN_WIDTH = 800
         self.SCREEN_HEIGHT = 1000  # Increased height for top and bottom gutters
@@ -28,47 +42,11 @@ class Game:
         self.WHITE = (255, 255, 255)
         self.BLACK = (0, 0, 0)
 
-        # Create the board
-        self.board: Board = Board(config_path=config_path)
-
-        # Determine available starting positions for robots (not on targets and not in the center)
-        available_robot_start_coords: list[tuple[int, int]] = []
-        reserved_cells = [(7, 7), (7, 8), (8, 7), (8, 8)]  # Central cells
-        for r in range(self.board.height):
-            for c in range(self.board.width):
-                if not self.board.grid[r][c].target and (r, c) not in reserved_cells:
-                    available_robot_start_coords.append((r, c))
-        random.shuffle(available_robot_start_coords)
-
-        # Create robots and assign random starting positions
-        robot_colors = [
-            RobotColor.RED,
-            RobotColor.BLUE,
-            RobotColor.GREEN,
-            RobotColor.YELLOW,
-        ]
-        self.robots: list[Robot] = []
-        self.initial_robot_positions: dict[RobotColor, tuple[int, int]] = {}
-        for i, color in enumerate(robot_colors):
-            if i < len(available_robot_start_coords):
-                row, col = available_robot_start_coords[i]
-                robot = Robot(color, row, col)
-                self.robots.append(robot)
-                self.initial_robot_positions[color] = (row, col)
-            else:
-                # Handle case where there aren't enough unique spots for all robots
-                logging.warning(
-                    f"Not enough unique starting positions for all robots. Robot {color.value} not placed."
-                )
+        super().__init__(config_path)
+        self.config_path = config_path
 
         self.selected_robot_index = 0
 
-        # Select a random goal target
-        self.goal_target = random.choice(list(Target))
-
-        self.target_cell_coords = self.board.get_target_coords(self.goal_target)
-        """(row, col) of the target cell"""
-
         # Initialize move counter
         self.move_count = 0
 
@@ -77,25 +55,40 @@ class Game:
         self.popup_message = ""
         self.popup_move_count = 0
 
-    @property
-    def target_robot_color(self) -> RobotColor:
-        return TARGET_ROBOT_COLORS[self.goal_target]
-
-    @property
-    def target_robot(self) -> Robot:
-        target_robot_color = self.target_robot_color
-        target_robots = [
-            robot for robot in self.robots if robot.color == target_robot_color
-        ]
-        assert len(target_robots) == 1, (
-            f"Illegal number of target robots, {target_robots}, {self.goal_target.value}"
-        )
-        return target_robots[0]
-
-    def _handle_input(self) -> None:
-        for event in pygame.event.get():
+        # Solver running in a worker process; see _start_solving()
+        self.print_solution = print_solution
+        self.background_solver: BackgroundSolver | None = None
+        self.optimal_move_count: int | None = None
+        """Length of the optimal solution from the round's starting positions"""
+        self.round_solution: list[Move] | None = None
+        self.round_solving = False
+        """Whether the solve of the round's starting positions is still running"""
+        self.hint_moves: list[Move] | None = None
+        """Optimal moves from the current positions, None while solving"""
+        self._hint_request: tuple[tuple[int, int], ...] | None = None
+        """Robot positions of the hint request in flight, if any"""
+        self.show_hint = False
+
+        # Frame pacing, see run()
+        self.max_fps = max_fps
+        self.idle = idle
+        self._redraw_needed = True
+
+        # Render caches, see _draw()
+        self._background: pygame.Surface | None = None
+        self._background_key: tuple[object, ...] | None = None
+        self._drawn_background: pygame.Surface | None = None
+        self._dirty_rects: list[pygame.Rect] = []
+        self._popup_overlay: pygame.Surface | None = None
+        self._move_counter_pos = (0, 0)
+
+    def _handle_input(self, events: list[pygame.event.Event]) -> None:
+        for event in events:
+            self._redraw_needed = True
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                self._drawn_background = None  # The window contents were lost
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if self.show_popup and self.ok_button_rect.collidepoint(event.pos):
                     self.show_popup = False  # Dismiss popup on OK button click
@@ -105,47 +98,124 @@ class Game:
                 if self.show_popup:
                     return  # Do not process key presses while popup is active
 
-                if event.key == pygame.K_1:
-                    self.selected_robot_index = 0
-                elif event.key == pygame.K_2:
-                    self.selected_robot_index = 1
-                elif event.key == pygame.K_3:
-                    self.selected_robot_index = 2
-                elif event.key == pygame.K_4:
-                    self.selected_robot_index = 3
+                # Number keys 1-9 select a robot, in legend order
+                if pygame.K_1 <= event.key < pygame.K_1 + len(self.robots):
+                    self.selected_robot_index = event.key - pygame.K_1
 
                 elif event.key == pygame.K_r:
                     # Reset board
-                    for robot in self.robots:
-                        initial_row, initial_col = self.initial_robot_positions[
-                            robot.color
-                        ]
-                        robot.row = initial_row
-                        robot.col = initial_col
+                    self.reset_robots()
                     self.move_count = 0
+                    self.show_hint = False
+                    # A hint being solved is for positions we just left
+                    self._hint_request = None
+                    if self.round_solution is not None:
+                        self.hint_moves = list(self.round_solution)
+                    else:
+                        self._request_hint()
+                elif event.key == pygame.K_h:
+                    self.show_hint = True
 
-                selected_robot = self.robots[self.selected_robot_index]
                 if event.key == pygame.K_UP:
-                    selected_robot.move(Direction.UP, self.board, self.robots)
-                    self.move_count += 1
+                    self._move_selected_robot(Direction.UP)
                 elif event.key == pygame.K_DOWN:
-                    selected_robot.move(Direction.DOWN, self.board, self.robots)
-                    self.move_count += 1
+                    self._move_selected_robot(Direction.DOWN)
                 elif event.key == pygame.K_LEFT:
-                    selected_robot.move(Direction.LEFT, self.board, self.robots)
-                    self.move_count += 1
+                    self._move_selected_robot(Direction.LEFT)
                 elif event.key == pygame.K_RIGHT:
-                    selected_robot.move(Direction.RIGHT, self.board, self.robots)
-                    self.move_count += 1
+                    self._move_selected_robot(Direction.RIGHT)
+
+    def _move_selected_robot(self, direction: Direction) -> None:
+        selected_robot = self.robots[self.selected_robot_index]
+        before = selected_robot.get_position()
+        selected_robot.move(direction, self.board, self.occupancy)
+        self.move_count += 1
+        if selected_robot.get_position() == before:
+            return
+        self.show_hint = False
+        move = (self.selected_robot_index, direction.name)
+        if self.hint_moves and self.hint_moves[0] == move:
+            # Still on an optimal path
+            self.hint_moves = self.hint_moves[1:]
+        else:
+            self._request_hint()
+
+    def _positions(self) -> tuple[tuple[int, int], ...]:
+        return tuple(robot.get_position() for robot in self.robots)
+
+    def _submit(self) -> None:
+        """Asks the background solver for the optimal moves from the current positions"""
+        assert self.background_solver is not None
+        self.background_solver.submit(
+            Scenario(
+                self.scenario.target_coords,
+                {robot.color: robot.get_position() for robot in self.robots},
+                self.goal_target,
+            )
+        )
 
-    def is_goal_target_reached(self) -> bool:
-        """Check if the goal target has been reached by the correct robot."""
-        return (self.target_robot.row, self.target_robot.col) == self.target_cell_coords
+    def _start_solving(self) -> None:
+        """Solves the round's starting positions, which gives the optimum"""
+        if self.background_solver is None:
+            return
+        self.hint_moves = None
+        self.round_solving = True
+        self._hint_request = None
+        self._submit()
+
+    def _request_hint(self) -> None:
+        """
+        Solves the current positions for the hint. Each request supersedes the
+        previous one, except the round's, which is waited for instead.
+        """
+        self.hint_moves = None
+        if self.background_solver is None or self.round_solving:
+            # _poll_solver asks once the round's solve is in
+            return
+        self._hint_request = self._positions()
+        self._submit()
+
+    def _poll_solver(self) -> None:
+        if self.background_solver is None:
+            return
+        solution = self.background_solver.poll()
+        if solution is None:
+            return
+        self._redraw_needed = True
+        if self.round_solving:
+            self._on_round_solved(solution)
+            return
+        if self._hint_request != self._positions():
+            return  # Dropped by a reset
+        self._hint_request = None
+        if not solution.solved:
+            logging.info(f"Background solver gave up: {solution}")
+            return
+        self.hint_moves = solution.moves
+
+    def _on_round_solved(self, solution: Solution) -> None:
+        self.round_solving = False
+        if solution.solved:
+            self.round_solution = list(solution.moves)
+            self.optimal_move_count = len(solution.moves)
+            if self.print_solution:
+                print("Solution found:", solution)
+        else:
+            logging.info(f"Background solver gave up: {solution}")
+        if self._positions() == tuple(self.initial_robot_positions.values()):
+            if self.round_solution is not None:
+                self.hint_moves = list(self.round_solution)
+        else:
+            # The player moved while the round was being solved
+            self._request_hint()
 
     def _update(self) -> None:
+        self._poll_solver()
+
         # Check if the target has been reached
         target_reached = self.is_goal_target_reached()
-        if target_reached:
+        if target_reached and not self.show_popup:
+            self._redraw_needed = True
             if self.elapsed_time is None:  # Only set elapsed_time once
                 self.elapsed_time = time.time() - self.start_time
             logging.info(
@@ -157,32 +227,68 @@ class Game:
         # TODO: Implement logic for new round (new target, reset robots, etc.)
 
     def _draw(self) -> None:
-        self.screen.fill(self.WHITE)
-
         top_gutter_height = 100
         board_draw_height = (
             self.SCREEN_HEIGHT - top_gutter_height - 100
         )  # 100 pixels for bottom gutter
 
-        self._draw_gutters(top_gutter_height, board_draw_height)
-        self._draw_game_title(top_gutter_height)
-        self._draw_legend(top_gutter_height)
-        self._draw_board_area(board_draw_height, top_gutter_height)
-        self._draw_robots(board_draw_height, top_gutter_height)
-        self._draw_goal_target(top_gutter_height, board_draw_height)
-
+        # Everything that only changes between rounds is pre-rendered once; each
+        # frame only restores the areas drawn on last frame and redraws those
+        background = self._get_background(top_gutter_height, board_draw_height)
+        if self._drawn_background is not background:
+            self.screen.blit(background, (0, 0))
+            self._drawn_background = background
+            self._dirty_rects = [self.screen.get_rect()]
+        else:
+            for rect in self._dirty_rects:
+                self.screen.blit(background, rect, rect)
+
+        rects = [
+            self._draw_move_counter(),
+            *self._draw_robots(board_draw_height, top_gutter_height),
+            *self._draw_solver_status(top_gutter_height + board_draw_height),
+        ]
         if self.show_popup:
             self._draw_popup()
-
-        pygame.display.flip()
+            rects = [self.screen.get_rect()]
+
+        pygame.display.update(self._dirty_rects + rects)
+        self._dirty_rects = rects
+
+    def _get_background(
+        self, top_gutter_height: int, board_draw_height: int
+    ) -> pygame.Surface:
+        """The static part of the screen, re-rendered when the size or board changes"""
+        key = (
+            self.screen.get_size(),
+            id(self.board),
+            self.board.revision,
+            self.goal_target,
+        )
+        if self._background is None or self._background_key != key:
+            self._background = pygame.Surface(self.screen.get_size())
+            self._background_key = key
+            self._background.fill(self.WHITE)
+            self._draw_gutters(self._background, top_gutter_height, board_draw_height)
+            self._draw_game_title(self._background, top_gutter_height)
+            self._draw_legend(self._background, top_gutter_height)
+            self._draw_board_area(
+                self._background, board_draw_height, top_gutter_height
+            )
+            self._draw_goal_target(
+                self._background, top_gutter_height, board_draw_height
+            )
+        return self._background
 
     def _draw_popup(self) -> None:
         # Draw a semi-transparent background
-        overlay = pygame.Surface(
-            (self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA
-        )
-        overlay.fill((0, 0, 0, 128))  # Black with 128 alpha (half transparent)
-        self.screen.blit(overlay, (0, 0))
+        if self._popup_overlay is None:
+            self._popup_overlay = pygame.Surface(
+                (self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA
+            )
+            # Black with 128 alpha (half transparent)
+            self._popup_overlay.fill((0, 0, 0, 128))
+        self.screen.blit(self._popup_overlay, (0, 0))
 
         # Draw the message box
         box_width = 600
@@ -197,8 +303,7 @@ class Game:
         )  # Black border
 
         # Draw the message text
-        font = pygame.font.SysFont(None, 40)
-        text_surface = font.render(self.popup_message, True, self.BLACK)
+        text_surface = render_text(self.popup_message, 40, self.BLACK)
         text_rect = text_surface.get_rect(
             center=(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT // 2)
         )
@@ -221,67 +326,88 @@ class Game:
             self.screen, self.BLACK, self.ok_button_rect, 2, 5
         )  # Black border
 
-        button_font = pygame.font.SysFont(None, 30)
-        button_text = button_font.render("OK", True, self.WHITE)
+        button_text = render_text("OK", 30, self.WHITE)
         button_text_rect = button_text.get_rect(center=self.ok_button_rect.center)
         self.screen.blit(button_text, button_text_rect)
 
-    def _draw_gutters(self, top_gutter_height: int, board_draw_height: int) -> None:
+    def _draw_gutters(
+        self, surface: pygame.Surface, top_gutter_height: int, board_draw_height: int
+    ) -> None:
         # Draw top gutter
         pygame.draw.rect(
-            self.screen, (200, 200, 200), (0, 0, self.SCREEN_WIDTH, top_gutter_height)
+            surface, (200, 200, 200), (0, 0, self.SCREEN_WIDTH, top_gutter_height)
         )  # Grey top gutter background
 
         # Draw bottom gutter
         gutter_y = top_gutter_height + board_draw_height
         pygame.draw.rect(
-            self.screen, (200, 200, 200), (0, gutter_y, self.SCREEN_WIDTH, 100)
+            surface, (200, 200, 200), (0, gutter_y, self.SCREEN_WIDTH, 100)
         )  # Grey gutter background
 
-    def _draw_game_title(self, top_gutter_height: int) -> None:
+    def _draw_game_title(self, surface: pygame.Surface, top_gutter_height: int) -> None:
         # Draw Game Title in top gutter
-        title_font = pygame.font.SysFont(None, 48)
-        title_text = title_font.render("RR_DEMO", True, self.BLACK)
+        title_text = render_text("RR_DEMO", 48, self.BLACK)
         title_rect = title_text.get_rect(
             center=(self.SCREEN_WIDTH // 2, top_gutter_height // 3)
         )
-        self.screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
 
-    def _draw_legend(self, top_gutter_height: int) -> None:
+    def _draw_legend(self, surface: pygame.Surface, top_gutter_height: int) -> None:
         # Draw legend in top gutter
-        font = pygame.font.SysFont(None, 24)
         legend_x = 10
         legend_y = top_gutter_height // 2 + 10  # Position below the title
-        for i, robot_instance in enumerate(self.robots):
-            text_color = ROBOT_COLORS[robot_instance.color]
-            text_surface = font.render(
-                f"{i + 1}: {robot_instance.color.value}", True, text_color
-            )
-            self.screen.blit(text_surface, (legend_x, legend_y))
+        # Shrink the text until every robot and the move counter fit in a row
+        counter_width = render_text("Moves: 000", 24, self.BLACK).get_width() + 50
+        for font_size in (24, 20, 16):
+            text_surfaces = [
+                render_text(
+                    f"{i + 1}: {robot_instance.color.value}",
+                    font_size,
+                    ROBOT_COLORS[robot_instance.color],
+                )
+                for i, robot_instance in enumerate(self.robots)
+            ]
+            legend_width = sum(text.get_width() + 20 for text in text_surfaces)
+            if legend_x + legend_width + counter_width <= self.SCREEN_WIDTH:
+                break
+        for text_surface in text_surfaces:
+            surface.blit(text_surface, (legend_x, legend_y))
             legend_x += text_surface.get_width() + 20
 
-        # Draw move counter
-        move_text = font.render(f"Moves: {self.move_count}", True, self.BLACK)
-        self.screen.blit(
-            move_text, (legend_x + 50, legend_y)
-        )  # Position next to legend
+        # The move counter changes every move, so _draw_move_counter draws it
+        self._move_counter_pos = (legend_x + 50, legend_y)  # Next to the legend
+
+    def _draw_move_counter(self) -> pygame.Rect:
+        move_text = render_text(f"Moves: {self.move_count}", 24, self.BLACK)
+        return self.screen.blit(move_text, self._move_counter_pos)
 
-    def _draw_board_area(self, board_draw_height: int, top_gutter_height: int) -> None:
-        board_surface = pygame.Surface((self.SCREEN_WIDTH, board_draw_height))
+    def _draw_board_area(
+        self, surface: pygame.Surface, board_draw_height: int, top_gutter_height: int
+    ) -> None:
+        board_surface = surface.subsurface(
+            (0, top_gutter_height, self.SCREEN_WIDTH, board_draw_height)
+        )
         board_surface.fill(self.WHITE)
-        self.board.draw(board_surface)
-        self.screen.blit(board_surface, (0, top_gutter_height))
+        draw_board(self.board, board_surface)
 
-    def _draw_robots(self, board_draw_height: int, top_gutter_height: int) -> None:
+    def _draw_robots(
+        self, board_draw_height: int, top_gutter_height: int
+    ) -> list[pygame.Rect]:
+        """Draws the robots and returns the areas drawn on"""
         cell_width = (self.SCREEN_WIDTH - 2 * self.board.buffer) // self.board.width
         cell_height = (board_draw_height - 2 * self.board.buffer) // self.board.height
+        rects: list[pygame.Rect] = []
         for i, robot_instance in enumerate(self.robots):
             # Calculate absolute screen coordinates for the robot's cell
             abs_x = self.board.buffer + robot_instance.col * cell_width
             abs_y = (
                 top_gutter_height + self.board.buffer + robot_instance.row * cell_height
             )
-            robot_instance.draw(self.screen, cell_width, cell_height, abs_x, abs_y)
+            rects.append(
+                draw_robot(
+                    robot_instance, self.screen, cell_width, cell_height, abs_x, abs_y
+                )
+            )
             if i == self.selected_robot_index:
                 x = self.board.buffer + robot_instance.col * cell_width
                 y = (
@@ -289,20 +415,24 @@ class Game:
                     + self.board.buffer
                     + robot_instance.row * cell_height
                 )  # Adjust y for top gutter
-                pygame.draw.rect(
-                    self.screen, (255, 255, 0), (x, y, cell_width, cell_height), 3
+                rects.append(
+                    pygame.draw.rect(
+                        self.screen, (255, 255, 0), (x, y, cell_width, cell_height), 3
+                    )
                 )  # Yellow border
+        return rects
 
-    def _draw_goal_target(self, top_gutter_height: int, board_draw_height: int) -> None:
+    def _draw_goal_target(
+        self, surface: pygame.Surface, top_gutter_height: int, board_draw_height: int
+    ) -> None:
         gutter_y = top_gutter_height + board_draw_height
-        font = pygame.font.SysFont(None, 24)
         # Draw Goal Target in gutter
-        goal_text = font.render("Goal Target:", True, self.BLACK)
-        self.screen.blit(goal_text, (10, gutter_y + 10))
+        goal_text = render_text("Goal Target:", 24, self.BLACK)
+        surface.blit(goal_text, (10, gutter_y + 10))
 
         # Draw Reset instruction
-        reset_text = font.render("R: reset", True, self.BLACK)
-        self.screen.blit(
+        reset_text = render_text("R: reset", 24, self.BLACK)
+        surface.blit(
             reset_text, (self.SCREEN_WIDTH - reset_text.get_width() - 10, gutter_y + 10)
         )
 
@@ -316,7 +446,7 @@ class Game:
 
             # Use a scaled size for the target in the gutter
             draw_target_shape(
-                self.screen,
+                surface,
                 target_shape,
                 target_color,
                 target_center_x,
@@ -324,6 +454,32 @@ class Game:
                 scaled_size,
             )
 
+    def _draw_solver_status(self, gutter_y: int) -> list[pygame.Rect]:
+        # Draw the optimal move count and the hint below the reset instruction
+        if self.background_solver is None:
+            return []
+        if self.optimal_move_count is None:
+            status = "Solving..."
+        else:
+            status = f"Optimal: {self.optimal_move_count} moves"
+        lines = [status, "H: hint"]
+        if self.show_hint:
+            if self.hint_moves is None:
+                lines.append("Hint: solving...")
+            elif self.hint_moves:
+                robot_idx, direction_name = self.hint_moves[0]
+                color = self.robots[robot_idx].color.value
+                lines.append(f"Hint: {robot_idx + 1} {color} {direction_name}")
+        rects: list[pygame.Rect] = []
+        y = gutter_y + 35
+        for line in lines:
+            text = render_text(line, 24, self.BLACK)
+            rects.append(
+                self.screen.blit(text, (self.SCREEN_WIDTH - text.get_width() - 10, y))
+            )
+            y += text.get_height() + 2
+        return rects
+
     def run(self) -> None:
         # Create the screen
         self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
@@ -332,9 +488,32 @@ class Game:
         self.start_time = time.time()
         self.elapsed_time: float | None = None
 
+        # Solve the round in the background while the player plays
+        self.background_solver = BackgroundSolver(self.config_path)
+        self._start_solving()
+
         # Game loop control
         self.running = True
-        while self.running:
-            self._handle_input()
-            self._update()
-            self._draw()
+        clock = pygame.time.Clock()
+        try:
+            while self.running:
+                if self.idle and not self._redraw_needed:
+                    self._handle_input(self._wait_for_events())
+                else:
+                    self._handle_input(pygame.event.get())
+                self._update()
+                if self._redraw_needed or not self.idle:
+                    self._draw()
+                    self._redraw_needed = False
+                clock.tick(self.max_fps)
+        finally:
+            self.background_solver.close()
+
+    def _wait_for_events(self) -> list[pygame.event.Event]:
+        """Sleeps until there is input, or until it is time to poll the solver"""
+        solving = self.background_solver is not None and self.background_solver.pending
+        timeout = IDLE_TIMEOUT_SOLVING_MS if solving else IDLE_TIMEOUT_MS
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event, *pygame.event.get()]
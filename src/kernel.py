@@ -0,0 +1,180 @@
+import weakref
+from collections.abc import Iterable
+
+from .board import Board
+from .common import Direction
+from .compiled_board import CompiledBoard
+
+# Direction order used for direction indices in packed moves
+DIRECTIONS: list[Direction] = list(Direction)
+
+_kernels: "weakref.WeakKeyDictionary[CompiledBoard, MoveKernel]" = (
+    weakref.WeakKeyDictionary()
+)
+"""Kernels already built by this process, keyed by their board's tables"""
+
+
+class MoveKernel:
+    """
+    Stateless robot moves on packed states.
+
+    A packed state is a single int holding every robot's cell index
+    (row * width + col) in cell_bits bits, robot 0 in the lowest bits.
+    On a 16x16 board that is one byte per robot, on a 64x64 board 12 bits, so
+    a state takes memory in proportion to the robot count whatever its width.
+    """
+
+    def __init__(self, width: int, height: int, stops: list[list[int]]) -> None:
+        """stops[direction_idx][cell] is the cell where the walls stop a robot"""
+        self.width = width
+        self.height = height
+        self.cell_count = width * height
+        self.cell_bits = max(1, (self.cell_count - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+        self.stops = stops
+
+        # Bitmask of the cells a robot passes through (start excluded), so that
+        # blockers are found with a single AND against the occupied cells
+        self.ray_masks: list[list[int]] = []
+        for direction_idx, stop_cells in enumerate(stops):
+            step = self._step(direction_idx)
+            masks: list[int] = []
+            for cell, stop in enumerate(stop_cells):
+                mask = 0
+                current = cell
+                while current != stop:
+                    current += step
+                    mask |= 1 << current
+                masks.append(mask)
+            self.ray_masks.append(masks)
+
+        # Moving towards lower cell indices (UP, LEFT) the nearest blocker is the
+        # highest set bit, otherwise the lowest one
+        self._towards_low = [self._step(d) < 0 for d in range(len(DIRECTIONS))]
+        self._backoff = [-self._step(d) for d in range(len(DIRECTIONS))]
+
+    @classmethod
+    def from_board(cls, board: Board) -> "MoveKernel":
+        """
+        The kernel of board. Kernels are stateless, so boards sharing one
+        CompiledBoard share one kernel and its tables are only built once
+        """
+        compiled = board.compiled
+        kernel = _kernels.get(compiled)
+        if kernel is None:
+            stops = [list(stop_cells) for stop_cells in compiled.stops]
+            kernel = cls(compiled.width, compiled.height, stops)
+            _kernels[compiled] = kernel
+        return kernel
+
+    def _step(self, direction_idx: int) -> int:
+        direction = DIRECTIONS[direction_idx]
+        if direction == Direction.UP:
+            return -self.width
+        if direction == Direction.DOWN:
+            return self.width
+        if direction == Direction.LEFT:
+            return -1
+        return 1
+
+    def cell_index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def pack(self, positions: Iterable[tuple[int, int]]) -> int:
+        """Packs (row, col) robot positions, in robot index order, into a state"""
+        state = 0
+        for i, (row, col) in enumerate(positions):
+            state |= (row * self.width + col) << (i * self.cell_bits)
+        return state
+
+    def unpack(self, state: int, robot_count: int) -> list[tuple[int, int]]:
+        """Returns the (row, col) of each robot in a packed state"""
+        positions: list[tuple[int, int]] = []
+        for i in range(robot_count):
+            cell = (state >> (i * self.cell_bits)) & self.cell_mask
+            positions.append(divmod(cell, self.width))
+        return positions
+
+    def position(self, state: int, robot_idx: int) -> int:
+        """Returns the cell index of one robot in a packed state"""
+        return (state >> (robot_idx * self.cell_bits)) & self.cell_mask
+
+    def occupied(self, state: int, robot_count: int) -> int:
+        """Returns a bitmask with one bit set per occupied cell"""
+        bits = self.cell_bits
+        mask = self.cell_mask
+        occupied = 0
+        for _ in range(robot_count):
+            occupied |= 1 << (state & mask)
+            state >>= bits
+        return occupied
+
+    def distances_to(self, target_cell: int) -> list[int]:
+        """
+        Returns, for every cell, the minimum number of moves a lone robot needs to
+        reach target_cell if other robots could stop it anywhere along a ray.
+        This never overestimates the real number of moves, so it is an admissible
+        search heuristic. Cells that cannot reach the target get cell_count.
+        """
+        unreachable = self.cell_count
+        distances = [unreachable] * self.cell_count
+        distances[target_cell] = 0
+        frontier = [target_cell]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier: list[int] = []
+            for cell in frontier:
+                # Walls block both ways, so every cell on a ray out of this cell
+                # can slide back into it in one move
+                for direction_idx, stop_cells in enumerate(self.stops):
+                    step = self._step(direction_idx)
+                    stop = stop_cells[cell]
+                    current = cell
+                    while current != stop:
+                        current += step
+                        if distances[current] == unreachable:
+                            distances[current] = depth
+                            next_frontier.append(current)
+            frontier = next_frontier
+        return distances
+
+    def canonical(self, state: int, fixed_robot_idx: int, robot_count: int) -> int:
+        """
+        Returns a key that is equal for all states which only differ by swapping
+        the robots other than fixed_robot_idx. The key is not a packed state.
+        """
+        bits = self.cell_bits
+        mask = self.cell_mask
+        key = (state >> (fixed_robot_idx * bits)) & mask
+        for cell in sorted(
+            [
+                (state >> (i * bits)) & mask
+                for i in range(robot_count)
+                if i != fixed_robot_idx
+            ]
+        ):
+            key = (key << bits) | cell
+        return key
+
+    def move(
+        self, state: int, robot_idx: int, direction_idx: int, occupied: int
+    ) -> int:
+        """
+        Returns the packed state after moving one robot.
+        occupied is the bitmask from occupied() for state; the moving robot's own
+        bit may be set, it is never on its own ray.
+        """
+        shift = robot_idx * self.cell_bits
+        pos = (state >> shift) & self.cell_mask
+        stop = self.stops[direction_idx][pos]
+        if stop == pos:
+            return state
+        blocked = self.ray_masks[direction_idx][pos] & occupied
+        if blocked:
+            if self._towards_low[direction_idx]:
+                blocker = blocked.bit_length() - 1
+            else:
+                blocker = (blocked & -blocked).bit_length() - 1
+            stop = blocker + self._backoff[direction_idx]
+        return state ^ ((pos ^ stop) << shift)
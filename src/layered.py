@@ -0,0 +1,342 @@
+import heapq
+import itertools
+import mmap
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import IO
+
+from .budget import CHECK_INTERVAL, BudgetExhausted, SearchBudget
+from .kernel import MoveKernel
+
+DEFAULT_MEMORY_LIMIT = 1 << 30
+"""Bytes of packed states LayeredSearch keeps in memory before spilling to disk"""
+
+# Sorting a chunk of candidates goes through Python ints in a set and a list,
+# which costs roughly this many bytes per state on top of the typed array
+_BYTES_PER_SORTED_STATE = 200
+
+
+def state_typecode(kernel: MoveKernel, robot_count: int) -> str:
+    """Returns the smallest array typecode that holds a packed state"""
+    state_bits = kernel.cell_bits * robot_count
+    for typecode in ("I", "L", "Q"):
+        if state_bits <= array(typecode).itemsize * 8:
+            return typecode
+    raise ValueError(f"Packed states of {state_bits} bits do not fit in an array")
+
+
+class StateRun:
+    """
+    A sorted, de-duplicated run of packed states. It starts out as an in-memory
+    array and can be spilled to a memory-mapped temp file.
+    """
+
+    def __init__(self, states: array) -> None:
+        self.typecode = states.typecode
+        self.states: Sequence[int] = states
+        self._file: IO[bytes] | None = None
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def from_file(cls, file: IO[bytes], typecode: str) -> "StateRun":
+        run = cls(array(typecode))
+        run._map(file)
+        return run
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state: int) -> bool:
+        states = self.states
+        i = bisect_left(states, state)
+        return i < len(states) and states[i] == state
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in memory, 0 once spilled"""
+        if self.spilled:
+            return 0
+        return len(self.states) * array(self.typecode).itemsize
+
+    def spill(self) -> None:
+        states = self.states
+        if self.spilled or not len(states):
+            return
+        assert isinstance(states, array)
+        file = tempfile.TemporaryFile()  # noqa: SIM115 - closed in close()
+        states.tofile(file)
+        self._map(file)
+
+    def _map(self, file: IO[bytes]) -> None:
+        file.flush()
+        self._file = file
+        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.states = memoryview(self._mmap).cast(self.typecode)
+
+    def close(self) -> None:
+        if isinstance(self.states, memoryview):
+            self.states.release()
+        self.states = array(self.typecode)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LayeredSearch:
+    """
+    Breadth-first search that stores every depth's states as a sorted typed
+    array instead of a set of Python ints. Each layer is expanded in chunks that
+    are sorted, filtered against the visited layers by binary search and merged
+    into the next layer. Whenever the in-memory layers and chunks exceed
+    memory_limit bytes, the oldest ones are moved to memory-mapped temp files.
+    There are no predecessor links: the path is rebuilt by looking up the
+    candidate predecessors of each state in the previous layer.
+    """
+
+    def __init__(
+        self,
+        kernel: MoveKernel,
+        robot_count: int,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ) -> None:
+        self.kernel = kernel
+        self.robot_count = robot_count
+        self.memory_limit = memory_limit
+        self.typecode = state_typecode(kernel, robot_count)
+        self.chunk_len = max(1 << 12, memory_limit // _BYTES_PER_SORTED_STATE)
+        # Move index -> (robot index, direction index)
+        self.moves: list[tuple[int, int]] = [
+            (robot_idx, direction_idx)
+            for robot_idx in range(robot_count)
+            for direction_idx in range(len(kernel.stops))
+        ]
+        self.layers: list[StateRun] = []
+
+    def search(
+        self,
+        initial_state: int,
+        target_robot_idx: int,
+        target_cell: int,
+        budget: SearchBudget | None = None,
+    ) -> list[tuple[int, int]] | None:
+        """
+        Returns the (robot index, direction index) moves of an optimal solution,
+        or None if the goal cannot be reached. Raises BudgetExhausted when budget
+        runs out.
+        """
+        self.close()
+        kernel = self.kernel
+        if kernel.position(initial_state, target_robot_idx) == target_cell:
+            return []
+        if budget is None:
+            budget = SearchBudget()
+        self.layers = [StateRun(array(self.typecode, [initial_state]))]
+        try:
+            while True:
+                frontier = self.layers[-1]
+                budget.start_depth(
+                    len(self.layers),
+                    len(frontier),
+                    sum(len(layer) for layer in self.layers),
+                )
+                generated = budget.stats.nodes_generated
+                goal, runs = self._expand(
+                    frontier, target_robot_idx, target_cell, budget
+                )
+                if goal is not None:
+                    for run in runs:
+                        run.close()
+                    return self._reconstruct(goal)
+                layer = self._merge(runs)
+                generated = budget.stats.nodes_generated - generated
+                budget.stats.duplicates += generated - len(layer)
+                if not len(layer):
+                    return None
+                self.layers.append(layer)
+                self._enforce_limit([])
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Releases every layer and its spill file"""
+        for layer in self.layers:
+            layer.close()
+        self.layers = []
+
+    def _expand(
+        self,
+        frontier: StateRun,
+        target_robot_idx: int,
+        target_cell: int,
+        budget: SearchBudget,
+    ) -> tuple[int | None, list[StateRun]]:
+        """
+        Generates the successors of frontier as filtered, sorted runs.
+        Returns a goal state as soon as one is generated.
+        """
+        kernel = self.kernel
+        move = kernel.move
+        occupied = kernel.occupied
+        robot_count = self.robot_count
+        target_shift = target_robot_idx * kernel.cell_bits
+        cell_mask = kernel.cell_mask
+        target_moves = [
+            (robot_idx, direction_idx)
+            for robot_idx, direction_idx in self.moves
+            if robot_idx == target_robot_idx
+        ]
+        other_moves = [
+            (robot_idx, direction_idx)
+            for robot_idx, direction_idx in self.moves
+            if robot_idx != target_robot_idx
+        ]
+
+        stats = budget.stats
+        runs: list[StateRun] = []
+        chunk = array(self.typecode)
+        try:
+            for batch in itertools.batched(frontier.states, CHECK_INTERVAL):
+                budget.expand(len(batch))
+                for i, state in enumerate(batch):
+                    occupied_cells = occupied(state, robot_count)
+                    for k, (robot_idx, direction_idx) in enumerate(target_moves):
+                        new_state = move(
+                            state, robot_idx, direction_idx, occupied_cells
+                        )
+                        if (new_state >> target_shift) & cell_mask == target_cell:
+                            # The rest of the batch was never expanded
+                            stats.nodes_expanded -= len(batch) - i - 1
+                            stats.nodes_generated += i * len(self.moves) + k + 1
+                            return new_state, runs
+                        if new_state != state:
+                            chunk.append(new_state)
+                    for robot_idx, direction_idx in other_moves:
+                        new_state = move(
+                            state, robot_idx, direction_idx, occupied_cells
+                        )
+                        if new_state != state:
+                            chunk.append(new_state)
+                    if len(chunk) >= self.chunk_len:
+                        runs.append(self._sorted_run(chunk))
+                        chunk = array(self.typecode)
+                        self._enforce_limit(runs)
+                stats.nodes_generated += len(batch) * len(self.moves)
+        except BudgetExhausted:
+            for run in runs:
+                run.close()
+            raise
+        if len(chunk):
+            runs.append(self._sorted_run(chunk))
+        return None, runs
+
+    def _sorted_run(self, chunk: array) -> StateRun:
+        """Sorts and de-duplicates chunk, dropping states of earlier layers"""
+        layers = self.layers
+        return StateRun(
+            array(
+                self.typecode,
+                [
+                    state
+                    for state in sorted(set(chunk))
+                    if not any(state in layer for layer in layers)
+                ],
+            )
+        )
+
+    def _merge(self, runs: list[StateRun]) -> StateRun:
+        """Merges sorted runs into one de-duplicated layer, on disk if it is large"""
+        writer = _RunWriter(self.typecode, self.chunk_len)
+        previous = -1
+        for state in heapq.merge(*(run.states for run in runs)):
+            if state != previous:
+                writer.append(state)
+                previous = state
+        for run in runs:
+            run.close()
+        return writer.finish()
+
+    def _enforce_limit(self, runs: list[StateRun]) -> None:
+        """Spills the oldest layers, then runs, until memory_limit is respected"""
+        in_memory = sum(run.nbytes for run in self.layers) + sum(
+            run.nbytes for run in runs
+        )
+        for run in [*self.layers, *runs]:
+            if in_memory <= self.memory_limit:
+                break
+            in_memory -= run.nbytes
+            run.spill()
+
+    def _reconstruct(self, goal: int) -> list[tuple[int, int]]:
+        """Walks back from goal through self.layers, one predecessor per layer"""
+        path: list[tuple[int, int]] = []
+        state = goal
+        for layer in reversed(self.layers):
+            parent, move_idx = self._find_parent(state, layer)
+            path.append(self.moves[move_idx])
+            state = parent
+        path.reverse()
+        return path
+
+    def _find_parent(self, state: int, layer: StateRun) -> tuple[int, int]:
+        """
+        Returns a (state, move index) in layer that leads to state. Only one robot
+        moves, along a row or a column, so its previous cell shares a row or a
+        column with its current cell.
+        """
+        kernel = self.kernel
+        move = kernel.move
+        bits = kernel.cell_bits
+        width = kernel.width
+        for move_idx, (robot_idx, direction_idx) in enumerate(self.moves):
+            shift = robot_idx * bits
+            cell = kernel.position(state, robot_idx)
+            row, col = divmod(cell, width)
+            candidates = [row * width + c for c in range(width)]
+            candidates += [r * width + col for r in range(kernel.height)]
+            for previous_cell in candidates:
+                if previous_cell == cell:
+                    continue
+                parent = state ^ ((cell ^ previous_cell) << shift)
+                if parent not in layer:
+                    continue
+                occupied_cells = kernel.occupied(parent, self.robot_count)
+                if move(parent, robot_idx, direction_idx, occupied_cells) == state:
+                    return parent, move_idx
+        raise RuntimeError("State has no predecessor in the previous layer")
+
+
+class _RunWriter:
+    """Collects sorted states into a StateRun, streaming to a temp file when large"""
+
+    def __init__(self, typecode: str, flush_len: int) -> None:
+        self.typecode = typecode
+        self.flush_len = flush_len
+        self.buffer = array(typecode)
+        self.file: IO[bytes] | None = None
+
+    def append(self, state: int) -> None:
+        self.buffer.append(state)
+        if len(self.buffer) >= self.flush_len:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()  # noqa: SIM115 - handed to StateRun
+        self.buffer.tofile(self.file)
+        self.buffer = array(self.typecode)
+
+    def finish(self) -> StateRun:
+        if self.file is None:
+            return StateRun(self.buffer)
+        if len(self.buffer):
+            self._flush()
+        return StateRun.from_file(self.file, self.typecode)
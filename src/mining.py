@@ -0,0 +1,162 @@
+import collections
+import contextlib
+import functools
+import itertools
+import json
+import pathlib
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any
+
+from .board import Board
+from .puzzle import Puzzle
+from .scenario import Scenario
+from .solver import SearchMode, Solver
+
+CHECKPOINT_INTERVAL = 5.0
+"""Seconds between checkpoints when no seed has produced results"""
+
+Record = dict[str, Any]
+
+
+@functools.cache
+def _get_board(config_path: pathlib.Path) -> Board:
+    return Board(config_path=config_path)
+
+
+def mine_seed(
+    config_path: pathlib.Path,
+    seed: int,
+    min_moves: int,
+    mode: SearchMode,
+    time_limit: float | None = None,
+) -> list[Record]:
+    """
+    Tries every target of seed's layout as the goal. A single BFS limited to
+    min_moves - 1 moves (Solver.solve_all) rules out the targets with short
+    solutions; only the remaining ones are solved in full. Returns one record
+    per fully solved target, in target order.
+    """
+    board = _get_board(config_path)
+    scenario = Scenario.from_seed(board, seed)
+    short = Solver(Puzzle(board=board, scenario=scenario)).solve_all(
+        max_depth=min_moves - 1
+    )
+    records: list[Record] = []
+    for target in scenario.target_coords:
+        if target in short:
+            continue
+        candidate = Scenario(
+            scenario.target_coords, scenario.robot_starts, target, seed
+        )
+        solver = Solver(Puzzle(board=board, scenario=candidate), mode=mode)
+        start = time.perf_counter()
+        solution = solver.solve(time_limit=time_limit)
+        elapsed = time.perf_counter() - start
+        records.append(
+            {
+                "seed": seed,
+                "target": target.value,
+                "status": solution.status.value,
+                "optimal_moves": len(solution.moves) if solution.solved else None,
+                "min_moves": solution.min_moves,
+                "moves": solution.moves,
+                "solve_time": round(elapsed, 6),
+            }
+        )
+    return records
+
+
+def resume_point(path: pathlib.Path) -> int | None:
+    """
+    Returns the seed of the last checkpoint in a mining output file, after
+    cutting the file back to that checkpoint, or None if there is none. Only
+    records followed by a checkpoint are known to be complete: anything after
+    the last one (such as a line torn by a crash) is dropped and mined again.
+    """
+    if not path.exists():
+        return None
+    last_seed = None
+    keep = 0
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line)
+            if "checkpoint" in record:
+                last_seed = record["checkpoint"]
+                keep = offset
+    with open(path, "r+b") as f:
+        f.truncate(keep)
+    return last_seed
+
+
+def _ordered_map(
+    executor: Executor, func: Callable[..., Any], args: Iterable[tuple], window: int
+) -> Iterator[Any]:
+    """
+    Like executor.map, but only keeps window tasks in flight, so the inputs can
+    be a million seeds long
+    """
+    pending: collections.deque[Future] = collections.deque()
+    for task_args in args:
+        pending.append(executor.submit(func, *task_args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def mine(
+    config_path: pathlib.Path,
+    output_path: pathlib.Path,
+    seeds: range,
+    min_moves: int,
+    mode: SearchMode = SearchMode.IDA_STAR,
+    workers: int = 1,
+    time_limit: float | None = None,
+) -> Iterator[Record]:
+    """
+    Mines seeds for puzzles whose optimal solution has at least min_moves
+    moves, appending a JSON line per fully solved candidate to output_path and
+    yielding it. Results are written in seed order, each seed's records
+    followed by a {"checkpoint": seed} line (at least every
+    CHECKPOINT_INTERVAL seconds), so a run that is interrupted continues after
+    the last checkpoint when started again with the same output_path.
+    """
+    last_seed = resume_point(output_path)
+    if last_seed is not None:
+        seeds = range(max(seeds.start, last_seed + 1), seeds.stop)
+    args = zip(
+        itertools.repeat(config_path),
+        seeds,
+        itertools.repeat(min_moves),
+        itertools.repeat(mode),
+        itertools.repeat(time_limit),
+    )
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(open(output_path, "a"))
+        if workers <= 1:
+            results = itertools.starmap(mine_seed, args)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(workers))
+            results = _ordered_map(executor, mine_seed, args, window=4 * workers)
+        last_checkpoint = time.monotonic()
+        checkpointed = True
+        for seed, records in zip(seeds, results):
+            now = time.monotonic()
+            if not records and now - last_checkpoint < CHECKPOINT_INTERVAL:
+                checkpointed = False
+                continue
+            lines = [*records, {"checkpoint": seed}]
+            # One write per seed, so a crash can only tear the last line
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+            f.flush()
+            last_checkpoint = now
+            checkpointed = True
+            yield from records
+        if not checkpointed:
+            f.write(json.dumps({"checkpoint": seeds[-1]}) + "\n")
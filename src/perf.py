@@ -0,0 +1,151 @@
+import json
+import math
+import pathlib
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+PERCENTILES = (10, 90, 99)
+
+Summary = dict[str, float]
+"""Statistics of one benchmark's per-call times in seconds, see summarize()"""
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """The q-th percentile of samples, interpolating between closest ranks"""
+    if not samples:
+        raise ValueError("percentile() of no samples")
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: list[float]) -> Summary:
+    summary = {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "samples": len(samples),
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(samples, q)
+    return summary
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int,
+    number: int | None = None,
+    setup: Callable[[], object] | None = None,
+) -> list[float]:
+    """
+    Seconds per call of func, one sample per repeat, each averaged over number
+    calls; by default enough calls for a sample to take 0.2s, as chosen by
+    timeit's autorange (which doubles as a warm-up). setup runs untimed before
+    every sample. Like timeit, garbage collection is off while timing.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        if setup is not None:
+            setup()
+        number, _ = timer.autorange()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        samples.append(timer.timeit(number) / number)
+    return samples
+
+
+def environment() -> dict[str, str]:
+    """Where a run was made; timings are only comparable on the same machine"""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def save_results(
+    path: pathlib.Path, results: dict[str, Summary], **metadata: Any
+) -> None:
+    document = {
+        "environment": environment(),
+        **metadata,
+        "benchmarks": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: pathlib.Path) -> dict[str, Summary]:
+    return json.loads(path.read_text())["benchmarks"]
+
+
+class Change(NamedTuple):
+    name: str
+    baseline: float
+    """Baseline median in seconds"""
+    current: float
+    """Current median in seconds"""
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+
+def compare(
+    baseline: dict[str, Summary], current: dict[str, Summary], threshold: float
+) -> tuple[list[Change], list[Change]]:
+    """
+    Returns (changes, regressions) for the benchmarks in both runs, comparing
+    medians. A regression is a median more than threshold (0.25 = 25%) slower
+    than the baseline's.
+    """
+    changes = [
+        Change(name, baseline[name]["median"], summary["median"])
+        for name, summary in current.items()
+        if name in baseline
+    ]
+    regressions = [change for change in changes if change.ratio > 1 + threshold]
+    return changes, regressions
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+def format_results(results: dict[str, Summary]) -> str:
+    name_width = max(map(len, results), default=0)
+    columns = ["median", "min", *(f"p{q}" for q in PERCENTILES)]
+    lines = [
+        f"{'benchmark':<{name_width}}  "
+        + "  ".join(f"{column:>10}" for column in columns)
+    ]
+    for name, summary in results.items():
+        cells = "  ".join(f"{format_seconds(summary[c]):>10}" for c in columns)
+        lines.append(f"{name:<{name_width}}  {cells}")
+    return "\n".join(lines)
+
+
+def format_comparison(changes: list[Change], threshold: float) -> str:
+    """A table of baseline vs current medians that flags the regressions"""
+    name_width = max((len(change.name) for change in changes), default=0)
+    lines = [f"{'benchmark':<{name_width}}  {'baseline':>10}  {'current':>10}  change"]
+    for change in changes:
+        flag = "  REGRESSION" if change.ratio > 1 + threshold else ""
+        lines.append(
+            f"{change.name:<{name_width}}  {format_seconds(change.baseline):>10}  "
+            f"{format_seconds(change.current):>10}  {change.ratio - 1:+7.1%}{flag}"
+        )
+    return "\n".join(lines)
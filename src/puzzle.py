@@ -0,0 +1,81 @@
+import pathlib
+
+from .board import Board
+from .common import TARGET_ROBOT_COLORS, RobotColor
+from .robots import Occupancy, Robot
+from .scenario import Scenario
+
+
+class Puzzle:
+    """
+    Headless game state: the board, the robots and the goal target, plus the
+    rules for reaching it. It does not import pygame, so the solver and the
+    benchmarks can use it without a display.
+    """
+
+    def __init__(
+        self,
+        config_path: pathlib.Path | None = None,
+        *,
+        board: Board | None = None,
+        scenario: Scenario | None = None,
+    ) -> None:
+        """
+        Builds a puzzle on board, or on a new Board read from config_path.
+        Without a scenario one is drawn from the global RNG, so random.seed()
+        still controls the puzzle.
+        """
+        # Create the board
+        if board is None:
+            if config_path is None:
+                raise ValueError("Either config_path or board is required")
+            board = Board(config_path=config_path)
+        self.board: Board = board
+
+        if scenario is None:
+            scenario = Scenario.from_global_random(self.board)
+        self.scenario = scenario
+        scenario.apply(self.board)
+
+        # Create robots at the scenario's starting positions
+        self.robots: list[Robot] = [
+            Robot(color, row, col)
+            for color, (row, col) in scenario.robot_starts.items()
+        ]
+        self.initial_robot_positions: dict[RobotColor, tuple[int, int]] = dict(
+            scenario.robot_starts
+        )
+        self.occupancy = Occupancy(self.robots)
+        """Cells of the robots; pass it to Robot.move to keep it current"""
+
+        self.goal_target = scenario.goal_target
+
+        self.target_cell_coords = scenario.target_coords[self.goal_target]
+        """(row, col) of the target cell"""
+
+    @property
+    def target_robot_color(self) -> RobotColor:
+        return TARGET_ROBOT_COLORS[self.goal_target]
+
+    @property
+    def target_robot(self) -> Robot:
+        target_robot_color = self.target_robot_color
+        target_robots = [
+            robot for robot in self.robots if robot.color == target_robot_color
+        ]
+        assert len(target_robots) == 1, (
+            f"Illegal number of target robots, {target_robots}, {self.goal_target.value}"
+        )
+        return target_robots[0]
+
+    def reset_robots(self) -> None:
+        """Moves every robot back to its starting position"""
+        for robot in self.robots:
+            initial_row, initial_col = self.initial_robot_positions[robot.color]
+            robot.row = initial_row
+            robot.col = initial_col
+        self.occupancy.rebuild(self.robots)
+
+    def is_goal_target_reached(self) -> bool:
+        """Check if the goal target has been reached by the correct robot."""
+        return (self.target_robot.row, self.target_robot.col) == self.target_cell_coords
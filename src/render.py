@@ -0,0 +1,156 @@
+import functools
+
+import pygame
+
+from .board import Board
+from .common import (  # Import TargetShape, ROBOT_COLORS, TARGET_SHAPES, TARGET_COLORS from common.py
+    ROBOT_COLORS,
+    TARGET_COLORS,
+    TARGET_SHAPES,
+    TargetShape,
+)
+from .robots import Robot
+
+
+def draw_target_shape(
+    screen: pygame.Surface,
+    target_shape: TargetShape,
+    target_color: tuple[int, int, int],
+    center_x: int,
+    center_y: int,
+    scale: int,
+) -> None:
+    if target_shape == TargetShape.CIRCLE:
+        pygame.draw.circle(screen, target_color, (center_x, center_y), scale // 2)
+    elif target_shape == TargetShape.SQUARE:
+        side = scale // 1.5
+        square_rect = pygame.Rect(
+            center_x - side // 2, center_y - side // 2, side, side
+        )
+        pygame.draw.rect(screen, target_color, square_rect)
+    elif target_shape == TargetShape.TRIANGLE:
+        point1 = (center_x, center_y - scale // 3)
+        point2 = (center_x - scale // 3, center_y + scale // 3)
+        point3 = (center_x + scale // 3, center_y + scale // 3)
+        pygame.draw.polygon(screen, target_color, [point1, point2, point3])
+    elif target_shape == TargetShape.ELLIPSE:
+        ellipse_rect = pygame.Rect(
+            center_x - scale // 3, center_y - scale // 4, 2 * scale // 3, 2 * scale // 4
+        )
+        pygame.draw.ellipse(screen, target_color, ellipse_rect)
+
+
+@functools.cache
+def get_font(size: int) -> pygame.font.Font:
+    """The default font at size, created once per size"""
+    return pygame.font.SysFont(None, size)
+
+
+@functools.lru_cache(maxsize=256)
+def render_text(text: str, size: int, color: tuple[int, int, int]) -> pygame.Surface:
+    """
+    Renders text with the default font. The surface is shared by every caller,
+    so it must only be blitted, never drawn on.
+    """
+    return get_font(size).render(text, True, color)
+
+
+def draw_board(board: Board, screen: pygame.Surface) -> None:
+    cell_width: int = (screen.get_width() - 2 * board.buffer) // board.width
+    cell_height: int = (screen.get_height() - 2 * board.buffer) // board.height
+
+    # Draw grid lines
+    for r in range(board.height):
+        for c in range(board.width):
+            x: int = board.buffer + c * cell_width
+            y: int = board.buffer + r * cell_height
+            # Draw horizontal grid line
+            pygame.draw.line(
+                screen, board.grid_line_color, (x, y), (x + cell_width, y), 1
+            )
+            # Draw vertical grid line
+            pygame.draw.line(
+                screen, board.grid_line_color, (x, y), (x, y + cell_height), 1
+            )
+
+    # Draw walls and targets
+    for r in range(board.height):
+        for c in range(board.width):
+            cell = board.grid[r][c]
+            x = board.buffer + c * cell_width
+            y = board.buffer + r * cell_height
+
+            if cell.has_wall_north:
+                pygame.draw.line(
+                    screen, board.wall_color, (x, y), (x + cell_width, y), 4
+                )
+            if cell.has_wall_east:
+                pygame.draw.line(
+                    screen,
+                    board.wall_color,
+                    (x + cell_width, y),
+                    (x + cell_width, y + cell_height),
+                    4,
+                )
+            if cell.has_wall_south:
+                pygame.draw.line(
+                    screen,
+                    board.wall_color,
+                    (x, y + cell_height),
+                    (x + cell_width, y + cell_height),
+                    4,
+                )
+            if cell.has_wall_west:
+                pygame.draw.line(
+                    screen, board.wall_color, (x, y), (x, y + cell_height), 4
+                )
+
+            if cell.target:
+                shape: TargetShape | None = TARGET_SHAPES.get(cell.target)
+                color: tuple[int, int, int] | None = TARGET_COLORS.get(cell.target)
+                if shape and color:
+                    center_x: int = x + cell_width // 2
+                    center_y: int = y + cell_height // 2
+                    draw_target_shape(
+                        screen, shape, color, center_x, center_y, cell_width
+                    )
+
+            if board.show_cell_coords:
+                text: pygame.Surface = render_text(f"{r},{c}", 24, (0, 0, 0))
+                screen.blit(text, (x + 5, y + 5))
+
+
+def draw_robot(
+    robot: Robot,
+    screen: pygame.Surface,
+    cell_width: int,
+    cell_height: int,
+    abs_x: int,
+    abs_y: int,
+) -> pygame.Rect:
+    """Draws robot in the cell at (abs_x, abs_y) and returns the area drawn on"""
+    x = abs_x
+    y = abs_y
+
+    # Draw robot body (triangle)
+    # Points for an isosceles triangle (base at bottom, apex pointing up)
+    point1 = (x + cell_width // 2, y + cell_height // 3)  # Apex
+    point2 = (x + cell_width // 3, y + 2 * cell_height // 3)  # Bottom-left
+    point3 = (x + 2 * cell_width // 3, y + 2 * cell_height // 3)  # Bottom-right
+    body = pygame.draw.polygon(
+        screen, ROBOT_COLORS[robot.color], [point1, point2, point3]
+    )
+    body = body.union(
+        pygame.draw.polygon(screen, (0, 0, 0), [point1, point2, point3], 2)
+    )  # Black border
+
+    # Draw robot head (circle)
+    head_x = x + cell_width // 2
+    head_y = y + cell_height // 3
+    pygame.draw.circle(
+        screen, ROBOT_COLORS[robot.color], (head_x, head_y), cell_width // 7
+    )
+    head = pygame.draw.circle(
+        screen, (0, 0, 0), (head_x, head_y), cell_width // 7, 2
+    )  # Black border
+    return body.union(head)
@@ -1,99 +1,123 @@
-import pygame
+from collections.abc import Iterable
 
 from .board import Board  # Import Board for type hinting
-from .common import (  # Import Direction, RobotColor, ROBOT_COLORS from common.py
-    ROBOT_COLORS,
-    Direction,
-    RobotColor,
-)
+from .common import Direction, RobotColor
 
 
 class Robot:
+    __slots__ = ("col", "color", "row")
+
     def __init__(self, color: RobotColor, row: int, col: int) -> None:
         self.color = color
         self.row = row
         self.col = col
 
-    def _is_robot_at(self, row: int, col: int, all_robots: list["Robot"]) -> bool:
-        for robot in all_robots:
-            if robot != self and robot.row == row and robot.col == col:
-                return True
-        return False
-
     def get_position(self) -> tuple[int, int]:
         return self.row, self.col
 
     def move(
-        self, direction: Direction, board: Board, all_robots: list["Robot"]
-    ) -> None:
-        if direction == Direction.UP:
-            while (
-                self.row > 0
-                and not board.grid[self.row][self.col].has_wall_north
-                and not board.grid[self.row - 1][self.col].has_wall_south
-            ):
-                # Check for other robots in the next cell
-                if self._is_robot_at(self.row - 1, self.col, all_robots):
-                    break
-                self.row -= 1
-        elif direction == Direction.DOWN:
-            while (
-                self.row < board.height - 1
-                and not board.grid[self.row][self.col].has_wall_south
-                and not board.grid[self.row + 1][self.col].has_wall_north
-            ):
-                # Check for other robots in the next cell
-                if self._is_robot_at(self.row + 1, self.col, all_robots):
-                    break
-                self.row += 1
-        elif direction == Direction.LEFT:
-            while (
-                self.col > 0
-                and not board.grid[self.row][self.col].has_wall_west
-                and not board.grid[self.row][self.col - 1].has_wall_east
-            ):
-                # Check for other robots in the next cell
-                if self._is_robot_at(self.row, self.col - 1, all_robots):
-                    break
-                self.col -= 1
-        elif direction == Direction.RIGHT:
-            while (
-                self.col < board.width - 1
-                and not board.grid[self.row][self.col].has_wall_east
-                and not board.grid[self.row][self.col + 1].has_wall_west
-            ):
-                # Check for other robots in the next cell
-                if self._is_robot_at(self.row, self.col + 1, all_robots):
-                    break
-                self.col += 1
-
-    def draw(
         self,
-        screen: pygame.Surface,
-        cell_width: int,
-        cell_height: int,
-        abs_x: int,
-        abs_y: int,
+        direction: Direction,
+        board: Board,
+        all_robots: "Occupancy | list[Robot]",
     ) -> None:
-        x = abs_x
-        y = abs_y
+        """
+        Slides the robot until a wall or another robot stops it. Pass the
+        Occupancy of the robots to find blockers without scanning every robot;
+        it is updated with the new position. A plain list of robots is scanned
+        instead, which is as fast for a handful of robots moved once.
+        """
+        # The board knows where the walls stop us; only robots on that ray matter
+        stop_row, stop_col = board.get_stop_coords(self.row, self.col, direction)
+        if stop_row == self.row and stop_col == self.col:
+            return
+        if isinstance(all_robots, Occupancy):
+            all_robots.slide(self, direction, stop_row, stop_col)
+            return
+        others = [robot for robot in all_robots if robot is not self]
+        if direction is Direction.UP:
+            for robot in others:
+                if robot.col == self.col and stop_row <= robot.row < self.row:
+                    stop_row = robot.row + 1
+        elif direction is Direction.DOWN:
+            for robot in others:
+                if robot.col == self.col and self.row < robot.row <= stop_row:
+                    stop_row = robot.row - 1
+        elif direction is Direction.LEFT:
+            for robot in others:
+                if robot.row == self.row and stop_col <= robot.col < self.col:
+                    stop_col = robot.col + 1
+        else:
+            for robot in others:
+                if robot.row == self.row and self.col < robot.col <= stop_col:
+                    stop_col = robot.col - 1
+        self.row = stop_row
+        self.col = stop_col
+
+
+class Occupancy:
+    """
+    The cells robots stand on, as one bitmask of occupied columns per row and
+    one of occupied rows per column. The nearest robot on a ray is then a single
+    mask operation, however many robots there are. Robot.move keeps it up to
+    date; after moving indexed robots any other way, call rebuild().
+    """
 
-        # Draw robot body (triangle)
-        # Points for an isosceles triangle (base at bottom, apex pointing up)
-        point1 = (x + cell_width // 2, y + cell_height // 3)  # Apex
-        point2 = (x + cell_width // 3, y + 2 * cell_height // 3)  # Bottom-left
-        point3 = (x + 2 * cell_width // 3, y + 2 * cell_height // 3)  # Bottom-right
-        pygame.draw.polygon(screen, ROBOT_COLORS[self.color], [point1, point2, point3])
-        pygame.draw.polygon(
-            screen, (0, 0, 0), [point1, point2, point3], 2
-        )  # Black border
+    __slots__ = ("_cols", "_rows")
+
+    def __init__(self, robots: Iterable[Robot] = ()) -> None:
+        self._rows: dict[int, int] = {}
+        """row -> bitmask of the columns occupied in that row"""
+        self._cols: dict[int, int] = {}
+        """col -> bitmask of the rows occupied in that column"""
+        self.rebuild(robots)
+
+    def __contains__(self, coords: tuple[int, int]) -> bool:
+        row, col = coords
+        return bool(self._rows.get(row, 0) >> col & 1)
+
+    def rebuild(self, robots: Iterable[Robot]) -> None:
+        """Forgets every robot and indexes robots at their current positions"""
+        self._rows.clear()
+        self._cols.clear()
+        for robot in robots:
+            if robot.get_position() in self:
+                raise ValueError(f"Two robots on cell {robot.get_position()}")
+            self._add(robot.row, robot.col)
+
+    def slide(
+        self, robot: Robot, direction: Direction, stop_row: int, stop_col: int
+    ) -> None:
+        """
+        Moves the indexed robot in direction, given that the walls stop it at
+        (stop_row, stop_col): it stops there or just before the first robot on
+        the way.
+        """
+        row, col = robot.row, robot.col
+        if direction is Direction.UP:
+            # Rows stop_row .. row - 1 of this column, nearest is the highest
+            blocked = self._cols.get(col, 0) & ((1 << row) - (1 << stop_row))
+            if blocked:
+                stop_row = blocked.bit_length()
+        elif direction is Direction.DOWN:
+            # Rows row + 1 .. stop_row, nearest is the lowest
+            blocked = self._cols.get(col, 0) & ((2 << stop_row) - (2 << row))
+            if blocked:
+                stop_row = (blocked & -blocked).bit_length() - 2
+        elif direction is Direction.LEFT:
+            blocked = self._rows.get(row, 0) & ((1 << col) - (1 << stop_col))
+            if blocked:
+                stop_col = blocked.bit_length()
+        else:
+            blocked = self._rows.get(row, 0) & ((2 << stop_col) - (2 << col))
+            if blocked:
+                stop_col = (blocked & -blocked).bit_length() - 2
+        self._rows[row] ^= 1 << col
+        self._cols[col] ^= 1 << row
+        self._add(stop_row, stop_col)
+        robot.row = stop_row
+        robot.col = stop_col
 
-        # Draw robot head (circle)
-        head_x = x + cell_width // 2
-        head_y = y + cell_height // 3
-        pygame.draw.circle(
-            screen, ROBOT_COLORS[self.color], (head_x, head_y), cell_width // 7
-        )
-        pygame.draw.circle(
-            screen, (0, 0, 0), (head_x, head_y), cell_width // 7, 2
-        )  # Black border
+    def _add(self, row: int, col: int) -> None:
+        self._rows[row] = self._rows.get(row, 0) | (1 << col)
+        self._cols[col] = self._cols.get(col, 0) | (1 << row)
@@ -0,0 +1,117 @@
+import functools
+import logging
+import random
+
+from .board import Board
+from .common import RobotColor, Target
+
+# Colors of the robots, in robot index order; a board with n robots uses the
+# first n
+ROBOT_ORDER: list[RobotColor] = list(RobotColor)
+
+
+def central_cells(width: int, height: int) -> set[tuple[int, int]]:
+    """The 2x2 block in the middle of the board (one row/column if odd-sized)"""
+    rows = {(height - 1) // 2, height // 2}
+    cols = {(width - 1) // 2, width // 2}
+    return {(r, c) for r in rows for c in cols}
+
+
+@functools.cache
+def _non_central_cells(width: int, height: int) -> tuple[tuple[int, int], ...]:
+    """All (row, col) of a board in row-major order, except the central cells"""
+    reserved_cells = central_cells(width, height)
+    return tuple(
+        (r, c)
+        for r in range(height)
+        for c in range(width)
+        if (r, c) not in reserved_cells
+    )
+
+
+class Scenario:
+    """
+    The random part of a puzzle: where each target sits, where each robot
+    starts and which target is the goal. It is small, picklable and built
+    without touching the global RNG, and is applied to an already-built Board
+    with apply(), so many scenarios can share one board.
+    """
+
+    def __init__(
+        self,
+        target_coords: dict[Target, tuple[int, int]],
+        robot_starts: dict[RobotColor, tuple[int, int]],
+        goal_target: Target,
+        seed: int | None = None,
+    ) -> None:
+        self.target_coords = target_coords
+        self.robot_starts = robot_starts
+        """Start (row, col) of each robot, in robot index order"""
+        self.goal_target = goal_target
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return (
+            f"Scenario(seed={self.seed}, goal_target={self.goal_target.value}, "
+            f"robot_starts={list(self.robot_starts.values())})"
+        )
+
+    @classmethod
+    def from_seed(cls, board: Board, seed: int) -> "Scenario":
+        """
+        Derives a scenario from seed with a private random.Random, so it is safe to
+        call from several threads. It draws the same numbers Puzzle used to draw
+        from the global RNG, so seeds keep producing the same puzzles.
+        """
+        scenario = cls.generate(board, random.Random(seed))
+        scenario.seed = seed
+        return scenario
+
+    @classmethod
+    def from_global_random(cls, board: Board) -> "Scenario":
+        """Draws a scenario from the global RNG, honouring random.seed()"""
+        rng = random.Random()
+        rng.setstate(random.getstate())
+        scenario = cls.generate(board, rng)
+        random.setstate(rng.getstate())
+        return scenario
+
+    @classmethod
+    def generate(cls, board: Board, rng: random.Random) -> "Scenario":
+        # Randomly assign target coordinates
+        available_coords = list(board.compiled.target_coordinates)
+        rng.shuffle(available_coords)
+
+        all_targets = list(Target)  # Get all target enums
+        if len(available_coords) < len(all_targets):
+            raise ValueError("Not enough unique coordinates for all targets.")
+        target_coords = dict(zip(all_targets, available_coords))
+
+        # Determine available starting positions for robots (not on targets and not in the center)
+        target_cells = set(target_coords.values())
+        available_robot_start_coords = [
+            cell
+            for cell in _non_central_cells(board.width, board.height)
+            if cell not in target_cells
+        ]
+        rng.shuffle(available_robot_start_coords)
+
+        robot_colors = ROBOT_ORDER[: board.robot_count]
+        if len(available_robot_start_coords) < len(robot_colors):
+            # Handle case where there aren't enough unique spots for all robots
+            logging.warning(
+                "Not enough unique starting positions for all robots. "
+                f"Robots {[color.value for color in robot_colors[len(available_robot_start_coords) :]]} not placed."
+            )
+        robot_starts = dict(zip(robot_colors, available_robot_start_coords))
+
+        # Select a random goal target
+        goal_target = rng.choice(all_targets)
+        return cls(target_coords, robot_starts, goal_target)
+
+    def apply(self, board: Board) -> None:
+        """
+        Places this scenario's targets on board. Puzzles sharing a board see the
+        targets of the scenario applied last.
+        """
+        board.assign_targets(self.target_coords)
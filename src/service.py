@@ -0,0 +1,212 @@
+import asyncio
+import collections
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from . import perf
+from .board import Board
+from .board_pool import BoardPool
+from .budget import SolveStatus
+from .common import Target
+from .scenario import ROBOT_ORDER, Scenario
+from .solver import SearchMode, Solution
+
+LATENCY_SAMPLES = 1000
+"""Number of recent request latencies the metrics are computed from"""
+
+# Outcomes that do not depend on the time limit, so they can be cached
+_CACHEABLE = (SolveStatus.SOLVED, SolveStatus.UNSOLVABLE)
+
+Message = dict[str, Any]
+PuzzleKey = tuple[tuple[tuple[int, int], ...], Target, tuple[int, int]]
+"""(robot positions in robot index order, goal target, goal cell)"""
+
+
+class SolverService:
+    """
+    Solves puzzles on one board for many concurrent clients. Searches run in a
+    pool of worker processes that build the board from shared memory, so the
+    event loop only parses requests and never waits for a search; a slow puzzle
+    holds up one worker, not the other clients. Identical requests share one
+    search while it runs, and finished results are kept in an LRU cache of
+    cache_size puzzles. Searches stop after time_limit seconds.
+
+    Clients send one JSON object per line and get one back per line, tagged
+    with the request's "id" and in completion order:
+
+        {"id": 1, "robots": [[r, c], ...], "goal": "RED_CIRCLE", "goal_cell": [r, c]}
+        {"id": 1, "status": "SOLVED", "moves": [[0, "UP"], ...], "min_moves": 3,
+         "cached": false}
+
+    robots lists every robot of the board in robot index order. A request of
+    {"id": 2, "metrics": true} returns metrics() instead; an invalid request
+    gets {"id": ..., "error": message}.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        workers: int | None = None,
+        mode: SearchMode = SearchMode.IDA_STAR,
+        time_limit: float | None = 30.0,
+        cache_size: int = 10_000,
+    ) -> None:
+        self.board = board
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.time_limit = time_limit
+        self.cache_size = cache_size
+        self._cache: collections.OrderedDict[PuzzleKey, Solution] = (
+            collections.OrderedDict()
+        )
+        self._in_flight: dict[PuzzleKey, asyncio.Future[Solution]] = {}
+        self._latencies: collections.deque[float] = collections.deque(
+            maxlen=LATENCY_SAMPLES
+        )
+        self.counters: collections.Counter[str] = collections.Counter()
+        """requests, cache_hits, deduplicated, searches and errors so far"""
+        self._pool = BoardPool(board, self.workers)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def metrics(self) -> Message:
+        """
+        Request counters, the searches running or waiting for a worker
+        (in_flight, queued) and latency statistics of recent requests, in
+        seconds
+        """
+        in_flight = len(self._in_flight)
+        latency = perf.summarize(list(self._latencies)) if self._latencies else {}
+        return {
+            **self.counters,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.workers),
+            "workers": self.workers,
+            "cached_puzzles": len(self._cache),
+            "latency": latency,
+        }
+
+    def parse(self, request: Message) -> PuzzleKey:
+        """The puzzle of a solve request; raises ValueError if it is malformed"""
+        try:
+            robots = tuple((int(r), int(c)) for r, c in request["robots"])
+            goal = Target(request["goal"])
+            goal_row, goal_col = request["goal_cell"]
+            goal_cell = (int(goal_row), int(goal_col))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed puzzle: {e!r}") from e
+        if len(robots) != self.board.robot_count:
+            raise ValueError(
+                f"Expected {self.board.robot_count} robots, got {len(robots)}"
+            )
+        if len(set(robots)) != len(robots):
+            raise ValueError("Two robots on one cell")
+        for row, col in (*robots, goal_cell):
+            if not (0 <= row < self.board.height and 0 <= col < self.board.width):
+                raise ValueError(f"Cell {(row, col)} is off the board")
+        return robots, goal, goal_cell
+
+    async def solve(self, key: PuzzleKey) -> tuple[Solution, bool]:
+        """Returns the Solution of a puzzle and whether it came from the cache"""
+        solution = self._cache.get(key)
+        if solution is not None:
+            self._cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return solution, True
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._search(key))
+            self._in_flight[key] = future
+        else:
+            self.counters["deduplicated"] += 1
+        # Shielded, so a client that disconnects does not cancel a search that
+        # other clients are waiting for
+        return await asyncio.shield(future), False
+
+    async def _search(self, key: PuzzleKey) -> Solution:
+        robots, goal, goal_cell = key
+        scenario = Scenario(
+            {goal: goal_cell}, dict(zip(ROBOT_ORDER, robots, strict=False)), goal
+        )
+        self.counters["searches"] += 1
+        try:
+            solution = await asyncio.wrap_future(
+                self._pool.submit(scenario, self.mode, self.time_limit)
+            )
+        finally:
+            del self._in_flight[key]
+        if solution.status in _CACHEABLE:
+            self._cache[key] = solution
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return solution
+
+    async def handle(self, request: Message) -> Message:
+        """The response to one decoded request"""
+        request_id = request.get("id")
+        if request.get("metrics"):
+            return {"id": request_id, **self.metrics()}
+        start = time.perf_counter()
+        self.counters["requests"] += 1
+        try:
+            key = self.parse(request)
+        except ValueError as e:
+            self.counters["errors"] += 1
+            return {"id": request_id, "error": str(e)}
+        try:
+            solution, cached = await self.solve(key)
+        except Exception as e:
+            logging.exception(f"Search for request {request_id} failed")
+            self.counters["errors"] += 1
+            return {"id": request_id, "error": f"Search failed: {e!r}"}
+        self._latencies.append(time.perf_counter() - start)
+        return {
+            "id": request_id,
+            "status": solution.status.value,
+            "moves": solution.moves,
+            "min_moves": solution.min_moves,
+            "cached": cached,
+        }
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if isinstance(request, dict):
+            response = await self.handle(request)
+        else:
+            response = {"id": None, "error": "A request must be a JSON object"}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers one client's requests concurrently until it disconnects"""
+        responses: set[asyncio.Task] = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer))
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+            await asyncio.gather(*responses)
+        except (ConnectionError, ValueError) as e:
+            # ValueError: a line longer than the reader's limit
+            logging.info(f"Dropping client: {e!r}")
+        finally:
+            for task in responses:
+                task.cancel()
+            writer.close()
+
+    async def start_unix_server(self, path: str) -> asyncio.Server:
+        return await asyncio.start_unix_server(self.serve_connection, path)
+
+    async def start_server(self, host: str, port: int) -> asyncio.Server:
+        return await asyncio.start_server(self.serve_connection, host, port)
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+from typing import Self
+
+from .common import Direction
+from .compiled_board import (
+    WALL_EAST,
+    WALL_NORTH,
+    WALL_SOUTH,
+    WALL_WEST,
+    CompiledBoard,
+    default_cache_dir,
+)
+
+# (row, col) unit step of each direction
+_STEPS: dict[Direction, tuple[int, int]] = {
+    Direction.UP: (-1, 0),
+    Direction.DOWN: (1, 0),
+    Direction.LEFT: (0, -1),
+    Direction.RIGHT: (0, 1),
+}
+_WALL_BITS: dict[Direction, int] = {
+    Direction.UP: WALL_NORTH,
+    Direction.DOWN: WALL_SOUTH,
+    Direction.LEFT: WALL_WEST,
+    Direction.RIGHT: WALL_EAST,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    board TEXT NOT NULL,
+    robots TEXT NOT NULL,
+    goal TEXT NOT NULL,
+    moves TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (board, robots, goal)
+);
+CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used);
+"""
+
+
+class BoardTransform:
+    """
+    One of the rotations/reflections of a board: (row, col) is optionally
+    transposed, then the row and/or the column is mirrored. Transposing is only
+    valid on square boards.
+    """
+
+    def __init__(
+        self, width: int, height: int, transpose: bool, flip_row: bool, flip_col: bool
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.transpose = transpose
+        self.flip_row = flip_row
+        self.flip_col = flip_col
+        self.directions: dict[Direction, Direction] = {}
+        for direction, step in _STEPS.items():
+            d_row, d_col = step[::-1] if transpose else step
+            mapped = (-d_row if flip_row else d_row, -d_col if flip_col else d_col)
+            self.directions[direction] = next(
+                d for d, s in _STEPS.items() if s == mapped
+            )
+        self.inverse_directions = {v: k for k, v in self.directions.items()}
+
+    def __repr__(self) -> str:
+        return (
+            f"BoardTransform(transpose={self.transpose}, "
+            f"flip_row={self.flip_row}, flip_col={self.flip_col})"
+        )
+
+    def coords(self, row: int, col: int) -> tuple[int, int]:
+        if self.transpose:
+            row, col = col, row
+        if self.flip_row:
+            row = self.height - 1 - row
+        if self.flip_col:
+            col = self.width - 1 - col
+        return row, col
+
+    def maps_walls(self, walls: bytes) -> bool:
+        """Whether the wall layout is unchanged by this transform"""
+        width = self.width
+        for cell, cell_walls in enumerate(walls):
+            row, col = self.coords(*divmod(cell, width))
+            mapped_walls = walls[row * width + col]
+            for direction, bit in _WALL_BITS.items():
+                mapped_bit = _WALL_BITS[self.directions[direction]]
+                if bool(cell_walls & bit) != bool(mapped_walls & mapped_bit):
+                    return False
+        return True
+
+
+def board_symmetries(board: CompiledBoard) -> list[BoardTransform]:
+    """The transforms, identity first, under which the board's walls are unchanged"""
+    square = board.width == board.height
+    transforms = [
+        BoardTransform(board.width, board.height, transpose, flip_row, flip_col)
+        for transpose in ((False, True) if square else (False,))
+        for flip_row in (False, True)
+        for flip_col in (False, True)
+    ]
+    return [t for t in transforms if t.maps_walls(board.walls)]
+
+
+class SolutionCache:
+    """
+    Optimal solutions stored in SQLite, keyed by the board's walls, the robot
+    positions and the goal (target robot and target cell). The least recently
+    used entries are dropped beyond max_entries.
+
+    When the walls are symmetric under a rotation or reflection, a puzzle and its
+    transformed copy share one entry: every transform is applied and the
+    smallest key is stored, with the moves' directions mapped to match.
+    """
+
+    def __init__(
+        self, path: pathlib.Path | None = None, max_entries: int = 100_000
+    ) -> None:
+        self.path = path or default_cache_dir() / "solutions.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        # Rows in the table, kept up to date by put() so that inserts do not
+        # have to count them; rows other connections add are only seen here
+        # once the cache is opened again
+        self._row_count = len(self)
+        # Fingerprint and symmetries of each board seen, keyed by its walls
+        self._boards: dict[bytes, tuple[str, list[BoardTransform]]] = {}
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def get(
+        self,
+        board: CompiledBoard,
+        robots: list[tuple[int, int]],
+        target_robot_idx: int,
+        target_coords: tuple[int, int],
+    ) -> list[tuple[int, str]] | None:
+        """
+        Returns the cached (robot index, direction name) moves for the puzzle,
+        or None on a miss. robots holds the (row, col) of each robot.
+        """
+        fingerprint, transform, robots_key, goal_key = self._key(
+            board, robots, target_robot_idx, target_coords
+        )
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT moves FROM solutions WHERE board = ? AND robots = ? AND goal = ?",
+                (fingerprint, robots_key, goal_key),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE solutions SET last_used = ? "
+                "WHERE board = ? AND robots = ? AND goal = ?",
+                (time.time_ns(), fingerprint, robots_key, goal_key),
+            )
+        return [
+            (robot_idx, transform.inverse_directions[Direction[name]].name)
+            for robot_idx, name in json.loads(row[0])
+        ]
+
+    def put(
+        self,
+        board: CompiledBoard,
+        robots: list[tuple[int, int]],
+        target_robot_idx: int,
+        target_coords: tuple[int, int],
+        moves: list[tuple[int, str]],
+    ) -> None:
+        """Stores moves as the solution of the puzzle, evicting old entries"""
+        fingerprint, transform, robots_key, goal_key = self._key(
+            board, robots, target_robot_idx, target_coords
+        )
+        stored_moves = [
+            (robot_idx, transform.directions[Direction[name]].name)
+            for robot_idx, name in moves
+        ]
+        moves_json = json.dumps(stored_moves)
+        now = time.time_ns()
+        with self.connection:
+            inserted = self.connection.execute(
+                "INSERT OR IGNORE INTO solutions VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, robots_key, goal_key, moves_json, now),
+            ).rowcount
+            if not inserted:
+                self.connection.execute(
+                    "UPDATE solutions SET moves = ?, last_used = ? "
+                    "WHERE board = ? AND robots = ? AND goal = ?",
+                    (moves_json, now, fingerprint, robots_key, goal_key),
+                )
+            self._row_count += inserted
+            excess = self._row_count - self.max_entries
+            if excess > 0:
+                self._row_count -= self.connection.execute(
+                    "DELETE FROM solutions WHERE rowid IN (SELECT rowid FROM "
+                    "solutions ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                ).rowcount
+
+    def _key(
+        self,
+        board: CompiledBoard,
+        robots: list[tuple[int, int]],
+        target_robot_idx: int,
+        target_coords: tuple[int, int],
+    ) -> tuple[str, BoardTransform, str, str]:
+        """Returns the board fingerprint, the chosen transform and the keys"""
+        known = self._boards.get(board.walls)
+        if known is None:
+            digest = hashlib.sha256(
+                f"{board.width}x{board.height}:".encode() + board.walls
+            ).hexdigest()
+            known = (digest, board_symmetries(board))
+            self._boards[board.walls] = known
+        fingerprint, transforms = known
+
+        best: tuple[str, str] | None = None
+        best_transform = transforms[0]
+        for transform in transforms:
+            robots_key = ";".join(
+                "{},{}".format(*transform.coords(row, col)) for row, col in robots
+            )
+            goal_key = "{}:{},{}".format(
+                target_robot_idx, *transform.coords(*target_coords)
+            )
+            if best is None or (robots_key, goal_key) < best:
+                best = (robots_key, goal_key)
+                best_transform = transform
+        assert best is not None
+        return fingerprint, best_transform, *best
@@ -1,109 +1,491 @@
-import copy
-from collections import deque
-from typing import List, NamedTuple, Tuple, TypeAlias
+import itertools
+from collections.abc import Callable
+from enum import Enum
+from typing import TYPE_CHECKING, List, Tuple, TypeAlias
 
-from .common import Direction, RobotColor
-from .game import Game
+from .budget import (
+    CHECK_INTERVAL,
+    BudgetExhausted,
+    CancelToken,
+    SearchBudget,
+    SearchProgress,
+    SolveStatus,
+)
+from .common import TARGET_ROBOT_COLORS, Target
+from .kernel import DIRECTIONS, MoveKernel
+from .layered import DEFAULT_MEMORY_LIMIT, LayeredSearch
+from .puzzle import Puzzle
 from .robots import Robot
+from .solution_cache import SolutionCache
+from .stats import SearchStats
+
+if TYPE_CHECKING:
+    from .vectorized import VectorizedSearch
 
 # Move: (robot index, direction name)
 Move: TypeAlias = Tuple[int, str]
 Coord: TypeAlias = Tuple[int, int]
 
 
-class State(NamedTuple):
-    RED: Coord
-    BLUE: Coord
-    GREEN: Coord
-    YELLOW: Coord
+State: TypeAlias = Tuple[Coord, ...]
+"""(row, col) of every robot, in robot index order"""
 
 
 class Solution:
-    def __init__(self, moves: List[Move] | None = None):
+    def __init__(
+        self,
+        moves: List[Move] | None = None,
+        status: SolveStatus = SolveStatus.SOLVED,
+        min_moves: int | None = None,
+        stats: SearchStats | None = None,
+    ):
         self.moves = moves or []
+        self.status = status
+        # Lower bound on the solution length; exact when solved
+        self.min_moves = len(self.moves) if min_moves is None else min_moves
+        # How the search went; None when the solution came from a cache
+        self.stats = stats
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SolveStatus.SOLVED
 
     def __repr__(self):
-        return f"Solution(moves={self.moves})"
+        return f"Solution(moves={self.moves}, status={self.status.value})"
 
 
 class RobotContainer:
     def __init__(self, robots: List[Robot]) -> None:
         self.robots = robots
         self.robot_map = {robot.color: robot for robot in robots}
-        self.red_robot = self.robot_map[RobotColor.RED]
-        self.yellow_robot = self.robot_map[RobotColor.YELLOW]
-        self.blue_robot = self.robot_map[RobotColor.BLUE]
-        self.green_robot = self.robot_map[RobotColor.GREEN]
 
     def get_state(self) -> State:
-        """Returns a State object with explicit members for each robot color"""
-        return State(
-            RED=self.red_robot.get_position(),
-            BLUE=self.blue_robot.get_position(),
-            GREEN=self.green_robot.get_position(),
-            YELLOW=self.yellow_robot.get_position(),
-        )
+        """Returns the robots' positions, in robot index order"""
+        return tuple([(robot.row, robot.col) for robot in self.robots])
 
     def apply_state(self, state: State) -> None:
         """Sets the robots' positions according to the given State"""
-        self.red_robot.row, self.red_robot.col = state.RED
-        self.blue_robot.row, self.blue_robot.col = state.BLUE
-        self.green_robot.row, self.green_robot.col = state.GREEN
-        self.yellow_robot.row, self.yellow_robot.col = state.YELLOW
+        for robot, (row, col) in zip(self.robots, state, strict=True):
+            robot.row = row
+            robot.col = col
+
+
+class SearchMode(Enum):
+    BFS = "BFS"
+    IDA_STAR = "IDA_STAR"
+    LAYERED = "LAYERED"
+    VECTORIZED = "VECTORIZED"
 
 
 class Solver:
-    def __init__(self, game: Game) -> None:
-        self.visited = set()
+    def __init__(
+        self,
+        puzzle: Puzzle,
+        symmetry: bool = False,
+        mode: SearchMode = SearchMode.BFS,
+        max_table_size: int = 4_000_000,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        cache: SolutionCache | None = None,
+        kernel: MoveKernel | None = None,
+    ) -> None:
+        """
+        symmetry: treat states that only differ by swapping the non-target robots
+        as the same state. They are interchangeable blockers, so this shrinks the
+        visited set without changing the optimal solution length, at the cost of
+        canonicalising every generated state.
+        mode: BFS, IDA* guided by the target robot's wall distance to the goal, a
+        layered BFS over typed arrays (see LayeredSearch) or a layered BFS
+        vectorised with NumPy (see VectorizedSearch). All of them return an
+        optimal solution.
+        max_table_size: entry limit of the IDA* transposition table.
+        memory_limit: bytes of states the layered BFS keeps in memory before it
+        spills layers to memory-mapped temp files.
+        cache: optional SolutionCache consulted before searching and filled
+        with every solution found.
+        kernel: MoveKernel of puzzle.board, to share one between solvers
+        instead of building its tables for every puzzle.
+        """
+        self.symmetry = symmetry
+        self.mode = mode
+        self.max_table_size = max_table_size
+        self.memory_limit = memory_limit
+        self.cache = cache
+        self.visited: dict[int, int] = {}
         self.solution_path: list[Move] = []
-        self.game = game
-        _robots = copy.deepcopy(game.robots)
+        self.puzzle = puzzle
+        _robots = [Robot(robot.color, robot.row, robot.col) for robot in puzzle.robots]
         self.robot_container = RobotContainer(_robots)
+        self.kernel = kernel or MoveKernel.from_board(puzzle.board)
 
-    def is_goal_state(self, game: Game, robots: list[Robot]) -> bool:
+        robots = self.robot_container.robots
+        self.robot_count = len(robots)
+        self.target_robot_idx = next(
+            i
+            for i, robot in enumerate(robots)
+            if robot.color == puzzle.target_robot_color
+        )
+        self.target_cell = self.kernel.cell_index(*puzzle.target_cell_coords)
+        # Move index -> (robot index, direction index), in the order moves are tried
+        self.moves: list[tuple[int, int]] = [
+            (robot_idx, direction_idx)
+            for robot_idx in range(self.robot_count)
+            for direction_idx in range(len(DIRECTIONS))
+        ]
+        self.move_bits = max(1, (len(self.moves) - 1).bit_length())
+
+    def is_goal_state(self, puzzle: Puzzle, robots: list[Robot]) -> bool:
         """Checks if the target robot has reached the goal target"""
-        target_robot_color = game.target_robot_color
+        target_robot_color = puzzle.target_robot_color
         target_robot = next(
             robot for robot in robots if robot.color == target_robot_color
         )
-        target_coords = game.target_cell_coords
+        target_coords = puzzle.target_cell_coords
         return (target_robot.row, target_robot.col) == target_coords
 
-    def solve(self) -> Solution:
+    def solve(
+        self,
+        *,
+        time_limit: float | None = None,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        progress: Callable[[SearchProgress], None] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> Solution:
         """
-        BFS to explore state space for Ricochet Robots.
+        Searches for the shortest sequence of moves that brings the target robot
+        to the goal target, using the configured SearchMode.
         Returns a Solution object with the path to the goal (if found).
+
+        The search stops after time_limit seconds, before looking for solutions
+        longer than max_depth moves, before expanding more than max_nodes states
+        or once cancel is set. It then returns an unsolved Solution whose status
+        says which limit was hit and whose min_moves is the best lower bound
+        found so far. progress is called with a SearchProgress whenever the
+        search starts looking one move deeper.
         """
-        robot_container = self.robot_container
-        robots = robot_container.robots
-        game = self.game
-        initial_state = robot_container.get_state()
-        self.visited: set[State] = set()
-        self.queue: deque[tuple[State, list[Move]]] = deque([(initial_state, [])])
-        self.queue.append((initial_state, []))  # (State, moves)
-        self.visited.add(initial_state)
-        solution = Solution()
-
-        while self.queue:
-            state, path = self.queue.popleft()
-            robot_container.apply_state(state)
-
-            if self.is_goal_state(game=self.game, robots=robots):
-                self.solution_path = path
-                solution = Solution(moves=path)
-                break
-
-            # For each robot, try each direction
-            for robot_idx, robot in enumerate(robots):
-                for direction in Direction:
-                    # Move the robot
-                    robot.move(direction, game.board, robots)
-                    new_state = robot_container.get_state()
-                    if new_state not in self.visited:
-                        self.visited.add(new_state)
-                        move_desc: Move = (robot_idx, direction.name)
-                        self.queue.append((new_state, path + [move_desc]))
-                    # Reset state for next iteration
-                    robot_container.apply_state(state)
+        budget = SearchBudget(time_limit, max_depth, max_nodes, progress, cancel)
+        if self.cache is None:
+            return self._search_within(budget)
+        cache_key = (
+            self.puzzle.board.compiled,
+            [robot.get_position() for robot in self.robot_container.robots],
+            self.target_robot_idx,
+            self.puzzle.target_cell_coords,
+        )
+        moves = self.cache.get(*cache_key)
+        if moves is not None:
+            if max_depth is not None and len(moves) > max_depth:
+                return Solution(status=SolveStatus.DEPTH_LIMIT, min_moves=len(moves))
+            self.solution_path = moves
+            return Solution(moves=moves)
+        solution = self._search_within(budget)
+        if solution.solved:
+            self.cache.put(*cache_key, solution.moves)
+        return solution
 
+    def _search_within(self, budget: SearchBudget) -> Solution:
+        try:
+            solution = self._search(budget)
+        except BudgetExhausted as e:
+            solution = Solution(status=e.status, min_moves=budget.min_moves)
+        budget.stats.finish()
+        solution.stats = budget.stats
         return solution
+
+    def _search(self, budget: SearchBudget) -> Solution:
+        if self.mode == SearchMode.IDA_STAR:
+            return self._solve_ida_star(budget)
+        if self.mode == SearchMode.LAYERED:
+            return self._solve_layered(budget)
+        if self.mode == SearchMode.VECTORIZED:
+            return self._solve_vectorized(budget)
+        return self._solve_bfs(budget)
+
+    def _initial_state(self) -> int:
+        return self.kernel.pack(
+            robot.get_position() for robot in self.robot_container.robots
+        )
+
+    def _solve_bfs(self, budget: SearchBudget) -> Solution:
+        """
+        BFS to explore state space for Ricochet Robots, one depth at a time.
+        States are packed ints (see MoveKernel), so no Robot is moved while searching.
+        """
+        kernel = self.kernel
+        move = kernel.move
+        occupied = kernel.occupied
+        canonical = kernel.canonical
+        robot_count = self.robot_count
+        target_robot_idx = self.target_robot_idx
+        target_shift = target_robot_idx * kernel.cell_bits
+        target_cell = self.target_cell
+        cell_mask = kernel.cell_mask
+        moves = self.moves
+        move_bits = self.move_bits
+        symmetry = self.symmetry
+
+        # Each visited state maps to its predecessor and the move index that led
+        # to it, packed as (parent << move_bits) | move_idx; the start maps to -1.
+        # The path is only rebuilt once the goal is found. With symmetry the keys
+        # are canonical forms while the queue and the links keep the real states,
+        # so the rebuilt moves use the real robot indices.
+        initial_state = self._initial_state()
+        visited: dict[int, int] = {self._visited_key(initial_state): -1}
+        self.visited = visited
+        if (initial_state >> target_shift) & cell_mask == target_cell:
+            return Solution()
+
+        stats = budget.stats
+        frontier = [initial_state]
+        depth = 0
+        try:
+            while frontier:
+                depth += 1
+                budget.start_depth(depth, len(frontier), len(visited))
+                next_frontier: list[int] = []
+                for batch in itertools.batched(frontier, CHECK_INTERVAL):
+                    budget.expand(len(batch))
+                    for i, state in enumerate(batch):
+                        # For each robot, try each direction
+                        occupied_cells = occupied(state, robot_count)
+                        parent_link = state << move_bits
+                        for move_idx, (robot_idx, direction_idx) in enumerate(moves):
+                            new_state = move(
+                                state, robot_idx, direction_idx, occupied_cells
+                            )
+                            key = (
+                                canonical(new_state, target_robot_idx, robot_count)
+                                if symmetry
+                                else new_state
+                            )
+                            if key in visited:
+                                continue
+                            visited[key] = parent_link | move_idx
+                            if (new_state >> target_shift) & cell_mask == target_cell:
+                                # The rest of the batch was never expanded
+                                stats.nodes_expanded -= len(batch) - i - 1
+                                stats.nodes_generated += i * len(moves) + move_idx + 1
+                                self.solution_path = self._reconstruct_path(new_state)
+                                return Solution(moves=self.solution_path)
+                            next_frontier.append(new_state)
+                    stats.nodes_generated += len(batch) * len(moves)
+                frontier = next_frontier
+        finally:
+            stats.visited = len(visited)
+            stats.duplicates = stats.nodes_generated - (len(visited) - 1)
+
+        return Solution(status=SolveStatus.UNSOLVABLE, min_moves=depth)
+
+    def solve_all(self, max_depth: int | None = None) -> dict[Target, Solution]:
+        """
+        Runs a single BFS from the current robot positions and returns the
+        optimal Solution for every target on the board, regardless of
+        puzzle.goal_target. Targets the matching robot cannot reach (within
+        max_depth moves, if given) are left out of the result.
+        Symmetry reduction is not used: which robots are interchangeable depends
+        on the target.
+        """
+        kernel = self.kernel
+        move = kernel.move
+        occupied = kernel.occupied
+        robots = self.robot_container.robots
+        robot_count = self.robot_count
+        moves = self.moves
+        move_bits = self.move_bits
+
+        # goal_cells[robot_idx] maps the cells of that robot's targets to the target
+        goal_cells: list[dict[int, Target]] = [{} for _ in range(robot_count)]
+        for target, coords in self.puzzle.scenario.target_coords.items():
+            color = TARGET_ROBOT_COLORS[target]
+            for robot_idx, robot in enumerate(robots):
+                if robot.color == color:
+                    goal_cells[robot_idx][kernel.cell_index(*coords)] = target
+        remaining = sum(len(cells) for cells in goal_cells)
+
+        initial_state = self._initial_state()
+        found: dict[Target, int] = {}
+        for robot_idx, cells in enumerate(goal_cells):
+            target = cells.get(kernel.position(initial_state, robot_idx))
+            if target is not None:
+                found[target] = initial_state
+        remaining -= len(found)
+
+        visited: dict[int, int] = {initial_state: -1}
+        self.visited = visited
+        frontier = [initial_state]
+        depth = 0
+        while frontier and remaining and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier: list[int] = []
+            for state in frontier:
+                occupied_cells = occupied(state, robot_count)
+                parent_link = state << move_bits
+                for move_idx, (robot_idx, direction_idx) in enumerate(moves):
+                    new_state = move(state, robot_idx, direction_idx, occupied_cells)
+                    if new_state in visited:
+                        continue
+                    visited[new_state] = parent_link | move_idx
+                    next_frontier.append(new_state)
+                    # Only the robot that just moved can have reached a new target
+                    target = goal_cells[robot_idx].get(
+                        kernel.position(new_state, robot_idx)
+                    )
+                    if target is not None and target not in found:
+                        found[target] = new_state
+                        remaining -= 1
+            frontier = next_frontier
+
+        return {
+            target: Solution(moves=self._reconstruct_path(state, symmetry=False))
+            for target, state in found.items()
+        }
+
+    def _solve_ida_star(self, budget: SearchBudget) -> Solution:
+        """
+        Iterative-deepening A*. The heuristic is the number of moves the target
+        robot alone needs to reach the goal when other robots may stop it
+        anywhere (MoveKernel.distances_to), which never overestimates, so the
+        first solution found is optimal. A transposition table, cleared for every
+        bound and capped at max_table_size entries, prunes states already reached
+        with fewer moves.
+        """
+        kernel = self.kernel
+        move = kernel.move
+        occupied = kernel.occupied
+        robot_count = self.robot_count
+        target_shift = self.target_robot_idx * kernel.cell_bits
+        cell_mask = kernel.cell_mask
+        moves = self.moves
+        max_table_size = self.max_table_size
+        visited_key = self._visited_key
+        distances = kernel.distances_to(self.target_cell)
+        unreachable = kernel.cell_count
+
+        table: dict[int, int] = {}
+        path: list[int] = []
+        countdown = CHECK_INTERVAL
+        transposition_hits = 0
+
+        shifts = [robot_idx * kernel.cell_bits for robot_idx in range(robot_count)]
+
+        def search(state: int, occupied_cells: int, depth: int, bound: int) -> int:
+            """
+            Returns -1 once the goal is found, else the smallest f over bound.
+            occupied_cells is the occupancy bitmask of state, updated from the
+            parent's by moving one bit instead of being recomputed.
+            """
+            remaining = distances[(state >> target_shift) & cell_mask]
+            if depth + remaining > bound:
+                return depth + remaining
+            if remaining == 0:
+                return -1
+            key = visited_key(state)
+            seen = table.get(key)
+            if seen is not None and seen <= depth:
+                nonlocal transposition_hits
+                transposition_hits += 1
+                return unreachable
+            if seen is not None or len(table) < max_table_size:
+                table[key] = depth
+            nonlocal countdown
+            countdown -= 1
+            if not countdown:
+                budget.expand(CHECK_INTERVAL)
+                countdown = CHECK_INTERVAL
+
+            next_bound = unreachable
+            for move_idx, (robot_idx, direction_idx) in enumerate(moves):
+                new_state = move(state, robot_idx, direction_idx, occupied_cells)
+                if new_state == state:
+                    continue
+                shift = shifts[robot_idx]
+                new_occupied = (
+                    occupied_cells
+                    ^ (1 << ((state >> shift) & cell_mask))
+                    ^ (1 << ((new_state >> shift) & cell_mask))
+                )
+                path.append(move_idx)
+                result = search(new_state, new_occupied, depth + 1, bound)
+                if result == -1:
+                    return -1
+                path.pop()
+                next_bound = min(next_bound, result)
+            return next_bound
+
+        initial_state = self._initial_state()
+        bound = distances[(initial_state >> target_shift) & cell_mask]
+        stats = budget.stats
+        try:
+            while bound < unreachable:
+                if bound:
+                    budget.start_depth(bound, 0, len(table))
+                table.clear()
+                bound = search(
+                    initial_state, occupied(initial_state, robot_count), 0, bound
+                )
+                if bound == -1:
+                    self.solution_path = [
+                        (moves[i][0], DIRECTIONS[moves[i][1]].name) for i in path
+                    ]
+                    return Solution(moves=self.solution_path)
+        finally:
+            # Nodes expanded since the last budget check
+            stats.nodes_expanded += CHECK_INTERVAL - countdown
+            stats.nodes_generated = stats.nodes_expanded * len(moves)
+            stats.duplicates = transposition_hits
+            stats.visited = len(table)
+        return Solution(status=SolveStatus.UNSOLVABLE, min_moves=budget.min_moves)
+
+    def _solve_layered(self, budget: SearchBudget) -> Solution:
+        """Memory-bounded BFS over sorted typed arrays, see LayeredSearch"""
+        search = LayeredSearch(self.kernel, self.robot_count, self.memory_limit)
+        return self._layer_search_solution(search, budget)
+
+    def _solve_vectorized(self, budget: SearchBudget) -> Solution:
+        """BFS expanding whole layers with NumPy, see VectorizedSearch"""
+        # Imported here so that the other modes never load NumPy
+        from .vectorized import VectorizedSearch
+
+        search = VectorizedSearch(self.kernel, self.robot_count)
+        return self._layer_search_solution(search, budget)
+
+    def _layer_search_solution(
+        self, search: "LayeredSearch | VectorizedSearch", budget: SearchBudget
+    ) -> Solution:
+        path = search.search(
+            self._initial_state(), self.target_robot_idx, self.target_cell, budget
+        )
+        if path is None:
+            return Solution(status=SolveStatus.UNSOLVABLE, min_moves=budget.min_moves)
+        self.solution_path = [
+            (robot_idx, DIRECTIONS[direction_idx].name)
+            for robot_idx, direction_idx in path
+        ]
+        return Solution(moves=self.solution_path)
+
+    def _visited_key(self, state: int) -> int:
+        if self.symmetry:
+            return self.kernel.canonical(state, self.target_robot_idx, self.robot_count)
+        return state
+
+    def _reconstruct_path(self, state: int, symmetry: bool | None = None) -> list[Move]:
+        """
+        Follows the predecessor links in self.visited back to the start.
+        symmetry says whether self.visited is keyed by canonical states and
+        defaults to self.symmetry.
+        """
+        if symmetry is None:
+            symmetry = self.symmetry
+
+        def key(state: int) -> int:
+            return self._visited_key(state) if symmetry else state
+
+        move_mask = (1 << self.move_bits) - 1
+        path: list[Move] = []
+        link = self.visited[key(state)]
+        while link != -1:
+            robot_idx, direction_idx = self.moves[link & move_mask]
+            path.append((robot_idx, DIRECTIONS[direction_idx].name))
+            link = self.visited[key(link >> self.move_bits)]
+        path.reverse()
+        return path
@@ -0,0 +1,76 @@
+import sys
+import time
+from typing import Any
+
+
+def peak_rss() -> int | None:
+    """The process's peak resident set size in bytes, None where unsupported"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SearchStats:
+    """
+    Counters of one search. A generated node is a successor computed for an
+    expanded state, including moves that leave the state unchanged; a duplicate
+    is a generated node that was already known. frontier_sizes[i] and
+    layer_times[i] are the states expanded and the seconds spent looking for
+    solutions of i + 1 moves (IDA*: for the i-th bound, with no frontier).
+    """
+
+    def __init__(self) -> None:
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicates = 0
+        self.frontier_sizes: list[int] = []
+        self.layer_times: list[float] = []
+        self.visited = 0
+        """States in the visited set (or IDA* transposition table) at the end"""
+        self.peak_memory: int | None = None
+        """Peak resident set size of the process in bytes, see peak_rss()"""
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+        self._layer_start: float | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchStats(expanded={self.nodes_expanded}, "
+            f"generated={self.nodes_generated}, duplicates={self.duplicates}, "
+            f"visited={self.visited}, depths={len(self.frontier_sizes)})"
+        )
+
+    def start_layer(self, frontier_size: int, visited: int) -> None:
+        self._end_layer()
+        self._layer_start = time.perf_counter()
+        self.frontier_sizes.append(frontier_size)
+        self.visited = visited
+
+    def finish(self, visited: int | None = None) -> None:
+        """Closes the last layer; visited defaults to the last reported size"""
+        self._end_layer()
+        if visited is not None:
+            self.visited = visited
+        self.elapsed = time.perf_counter() - self._start
+        self.peak_memory = peak_rss()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "duplicates": self.duplicates,
+            "frontier_sizes": self.frontier_sizes,
+            "layer_times": [round(t, 6) for t in self.layer_times],
+            "visited": self.visited,
+            "peak_memory": self.peak_memory,
+            "elapsed": round(self.elapsed, 6),
+        }
+
+    def _end_layer(self) -> None:
+        if self._layer_start is not None:
+            self.layer_times.append(time.perf_counter() - self._layer_start)
+            self._layer_start = None
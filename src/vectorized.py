@@ -0,0 +1,176 @@
+from typing import Any
+
+from .budget import SearchBudget
+from .common import Direction
+from .kernel import DIRECTIONS, MoveKernel
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency, see the "fast" extra
+    np = None
+
+# States expanded per NumPy call; the budget is checked between slices
+_SLICE_LEN = 1 << 14
+
+
+class VectorizedSearch:
+    """
+    Breadth-first search that expands a whole layer at once with NumPy. A layer
+    is a sorted uint64 array of packed states. For every robot and direction the
+    wall stop comes from the kernel's stop table with one fancy-indexing lookup,
+    and robots on the ray are applied with array comparisons. New states are
+    de-duplicated with np.unique and dropped from earlier layers with
+    np.searchsorted. Like LayeredSearch it keeps no predecessor links; the path
+    is rebuilt by re-expanding the previous layers once the goal is found.
+    """
+
+    def __init__(self, kernel: MoveKernel, robot_count: int) -> None:
+        if np is None:
+            raise ImportError(
+                "VectorizedSearch needs numpy; install it with the 'fast' extra"
+            )
+        if kernel.cell_bits * robot_count > 64:
+            raise ValueError("Packed states do not fit in 64 bits")
+        self.kernel = kernel
+        self.robot_count = robot_count
+        self.stops = np.array(kernel.stops, dtype=np.int64)
+        # Move index -> (robot index, direction index)
+        self.moves: list[tuple[int, int]] = [
+            (robot_idx, direction_idx)
+            for robot_idx in range(robot_count)
+            for direction_idx in range(len(kernel.stops))
+        ]
+        self.layers: list[Any] = []
+        self._vertical = [
+            direction in (Direction.UP, Direction.DOWN) for direction in DIRECTIONS
+        ]
+        self._towards_low = [
+            direction in (Direction.UP, Direction.LEFT) for direction in DIRECTIONS
+        ]
+
+    def search(
+        self,
+        initial_state: int,
+        target_robot_idx: int,
+        target_cell: int,
+        budget: SearchBudget | None = None,
+    ) -> list[tuple[int, int]] | None:
+        """
+        Returns the (robot index, direction index) moves of an optimal solution,
+        or None if the goal cannot be reached. Raises BudgetExhausted when budget
+        runs out.
+        """
+        kernel = self.kernel
+        if kernel.position(initial_state, target_robot_idx) == target_cell:
+            return []
+        if budget is None:
+            budget = SearchBudget()
+        self.layers = [np.array([initial_state], dtype=np.uint64)]
+        try:
+            while True:
+                frontier = self.layers[-1]
+                budget.start_depth(
+                    len(self.layers),
+                    frontier.size,
+                    sum(layer.size for layer in self.layers),
+                )
+                generated: list[Any] = []
+                generated_count = 0
+                for start in range(0, frontier.size, _SLICE_LEN):
+                    states = frontier[start : start + _SLICE_LEN]
+                    budget.expand(states.size)
+                    successors = self._successors(states)
+                    generated_count += states.size * len(self.moves)
+                    budget.stats.nodes_generated += states.size * len(self.moves)
+                    goal = self._find_goal(successors, target_robot_idx, target_cell)
+                    if goal is not None:
+                        return self._reconstruct(goal)
+                    generated.append(np.unique(np.concatenate(successors)))
+
+                candidates = np.unique(np.concatenate(generated))
+                for layer in self.layers:
+                    candidates = candidates[~_contains(layer, candidates)]
+                budget.stats.duplicates += generated_count - candidates.size
+                if not candidates.size:
+                    return None
+                self.layers.append(candidates)
+        finally:
+            self.layers = []
+
+    def _find_goal(
+        self, successors: list[Any], target_robot_idx: int, target_cell: int
+    ) -> int | None:
+        """Returns a successor state with the target robot on the target cell"""
+        for move_idx, (robot_idx, _) in enumerate(self.moves):
+            if robot_idx != target_robot_idx:
+                continue
+            positions = self._positions(successors[move_idx], robot_idx)
+            hits = np.flatnonzero(positions == target_cell)
+            if hits.size:
+                return int(successors[move_idx][hits[0]])
+        return None
+
+    def _positions(self, states: Any, robot_idx: int) -> Any:
+        shift = np.uint64(robot_idx * self.kernel.cell_bits)
+        return ((states >> shift) & np.uint64(self.kernel.cell_mask)).astype(np.int64)
+
+    def _successors(self, states: Any) -> list[Any]:
+        """Returns, per move index, the successor of every state in states"""
+        width = self.kernel.width
+        positions = [self._positions(states, i) for i in range(self.robot_count)]
+        rows = [position // width for position in positions]
+        cols = [position % width for position in positions]
+
+        successors: list[Any] = []
+        for robot_idx, direction_idx in self.moves:
+            position = positions[robot_idx]
+            stop = self.stops[direction_idx][position]
+            vertical = self._vertical[direction_idx]
+            # Coordinate along the move, and the one that must match to block
+            along = rows if vertical else cols
+            across = cols if vertical else rows
+            start = along[robot_idx]
+            end = stop // width if vertical else stop % width
+            towards_low = self._towards_low[direction_idx]
+            for other_idx in range(self.robot_count):
+                if other_idx == robot_idx:
+                    continue
+                other = along[other_idx]
+                on_ray = across[other_idx] == across[robot_idx]
+                if towards_low:
+                    on_ray &= (other < start) & (other >= end)
+                    end = np.where(on_ray, other + 1, end)
+                else:
+                    on_ray &= (other > start) & (other <= end)
+                    end = np.where(on_ray, other - 1, end)
+            if vertical:
+                new_position = end * width + cols[robot_idx]
+            else:
+                new_position = rows[robot_idx] * width + end
+            shift = np.uint64(robot_idx * self.kernel.cell_bits)
+            change = (position ^ new_position).astype(np.uint64) << shift
+            successors.append(states ^ change)
+        return successors
+
+    def _reconstruct(self, goal: int) -> list[tuple[int, int]]:
+        """Walks back from goal by re-expanding each earlier layer"""
+        path: list[tuple[int, int]] = []
+        state = goal
+        for layer in reversed(self.layers):
+            for move_idx, successors in enumerate(self._successors(layer)):
+                hits = np.flatnonzero(successors == np.uint64(state))
+                if hits.size:
+                    path.append(self.moves[move_idx])
+                    state = int(layer[hits[0]])
+                    break
+            else:
+                raise RuntimeError("State has no predecessor in the previous layer")
+        path.reverse()
+        return path
+
+
+def _contains(layer: Any, states: Any) -> Any:
+    """Boolean mask of the states that are in the sorted array layer"""
+    idx = np.searchsorted(layer, states)
+    idx[idx == layer.size] = 0
+    return layer[idx] == states
@@ -0,0 +1,37 @@
+import pathlib
+import time
+
+from src.background import BackgroundSolver
+from src.board import Board
+from src.scenario import Scenario
+from src.solver import Solution
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _wait(solver: BackgroundSolver, timeout: float = 30.0) -> Solution:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        solution = solver.poll()
+        if solution is not None:
+            return solution
+        time.sleep(0.01)
+    raise AssertionError("No result from the background solver")
+
+
+def test_newest_request_wins():
+    board = Board(CONFIG_PATH)
+    solver = BackgroundSolver(CONFIG_PATH)
+    try:
+        assert not solver.pending
+        # Seed 33 needs a long search; the next request cancels it
+        solver.submit(Scenario.from_seed(board, 33))
+        solver.submit(Scenario.from_seed(board, 4))
+        assert solver.pending
+        start = time.monotonic()
+        solution = _wait(solver)
+        assert time.monotonic() - start < 10
+        assert len(solution.moves) == 6
+        assert not solver.pending
+    finally:
+        solver.close()
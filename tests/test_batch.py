@@ -0,0 +1,45 @@
+import pathlib
+
+import pytest
+import yaml
+
+from src.batch import solve_many
+from src.board import Board
+from src.common import Direction
+from src.puzzle import Puzzle
+from src.scenario import Scenario
+from src.solver import SearchMode, Solver
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def test_solve_many_matches_solving_one_by_one():
+    board = Board(config_path=CONFIG_PATH)
+    puzzles = [
+        Puzzle(board=board, scenario=Scenario.from_seed(board, seed))
+        for seed in range(6)
+    ]
+    # Workers solve the robots where they stand, not where the scenario starts
+    puzzles[0].robots[0].move(Direction.DOWN, board, puzzles[0].occupancy)
+    expected = [len(Solver(puzzle).solve().moves) for puzzle in puzzles]
+
+    for workers in (1, 2):
+        results = dict(solve_many(puzzles, workers=workers, mode=SearchMode.IDA_STAR))
+        assert sorted(results) == list(range(6))
+        assert [len(results[i].moves) for i in range(6)] == expected
+
+
+def test_solve_many_needs_one_board(tmp_path: pathlib.Path):
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    config["robot_count"] = 5
+    variant_path = tmp_path / "variant.yaml"
+    variant_path.write_text(yaml.safe_dump(config))
+    puzzles = [
+        Puzzle(board=board, scenario=Scenario.from_seed(board, 0))
+        for board in (
+            Board(config_path=CONFIG_PATH),
+            Board(variant_path, cache_dir=tmp_path),
+        )
+    ]
+    with pytest.raises(ValueError, match="same board"):
+        list(solve_many(puzzles, workers=1))
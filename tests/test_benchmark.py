@@ -0,0 +1,12 @@
+from benchmark import sweep_seeds
+from src.solver import SearchMode
+
+
+def test_sharded_sweep_matches_sequential_in_seed_order():
+    seeds = range(4)
+    sequential = list(sweep_seeds(seeds, SearchMode.IDA_STAR, workers=1))
+    sharded = list(sweep_seeds(seeds, SearchMode.IDA_STAR, workers=2))
+    assert [result[0] for result in sharded] == list(seeds)
+    assert [len(result[1]) for result in sharded] == [
+        len(result[1]) for result in sequential
+    ]
@@ -0,0 +1,94 @@
+import pathlib
+import random
+
+import pytest
+
+from src.board import Board
+from src.common import Direction, RobotColor, Target
+from src.robots import Occupancy, Robot
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _walk(
+    board: Board,
+    row: int,
+    col: int,
+    direction: Direction,
+    blockers: frozenset[tuple[int, int]] = frozenset(),
+) -> tuple[int, int]:
+    while board.can_step(row, col, direction):
+        next_row, next_col = row, col
+        if direction == Direction.UP:
+            next_row -= 1
+        elif direction == Direction.DOWN:
+            next_row += 1
+        elif direction == Direction.LEFT:
+            next_col -= 1
+        else:
+            next_col += 1
+        if (next_row, next_col) in blockers:
+            break
+        row, col = next_row, next_col
+    return row, col
+
+
+def test_stop_table_matches_cell_walk():
+    board = Board(CONFIG_PATH)
+    for r in range(board.height):
+        for c in range(board.width):
+            for direction in Direction:
+                assert board.get_stop_coords(r, c, direction) == _walk(
+                    board, r, c, direction
+                )
+
+
+def test_ray_ends_at_stop():
+    board = Board(CONFIG_PATH)
+    assert board.get_ray(0, 0, Direction.UP) == ()
+    ray = board.get_ray(0, 0, Direction.DOWN)
+    assert ray[-1] == board.get_stop_coords(0, 0, Direction.DOWN)
+    assert all(col == 0 for _, col in ray)
+
+
+def test_robot_stops_before_robot_on_ray():
+    board = Board(CONFIG_PATH)
+    mover = Robot(RobotColor.RED, 0, 0)
+    blocker = Robot(RobotColor.BLUE, 2, 0)
+    bystander = Robot(RobotColor.GREEN, 1, 1)
+    robots = [mover, blocker, bystander]
+    mover.move(Direction.DOWN, board, robots)
+    assert mover.get_position() == (1, 0)
+    mover.move(Direction.UP, board, robots)
+    assert mover.get_position() == (0, 0)
+
+
+def test_assign_targets_bumps_revision():
+    board = Board(CONFIG_PATH)
+    revision = board.revision
+    board.assign_targets({Target.RED_CIRCLE: (0, 0)})
+    assert board.revision == revision + 1
+    assert board.grid[0][0].target == Target.RED_CIRCLE
+
+
+def test_occupancy_matches_stepping_past_robots():
+    board = Board(CONFIG_PATH)
+    rng = random.Random(0)
+    cells = rng.sample([(row, col) for row in range(16) for col in range(16)], 8)
+    robots = [Robot(RobotColor.RED, row, col) for row, col in cells]
+    occupancy = Occupancy(robots)
+    # Copies moved with a plain list of robots, which is scanned instead
+    scanned = [Robot(RobotColor.RED, row, col) for row, col in cells]
+    for _ in range(500):
+        idx = rng.randrange(len(robots))
+        robot = robots[idx]
+        direction = rng.choice(list(Direction))
+        others = frozenset(r.get_position() for r in robots if r is not robot)
+        expected = _walk(board, robot.row, robot.col, direction, others)
+        robot.move(direction, board, occupancy)
+        scanned[idx].move(direction, board, scanned)
+        assert robot.get_position() == expected
+        assert scanned[idx].get_position() == expected
+    assert all(robot.get_position() in occupancy for robot in robots)
+    with pytest.raises(ValueError):
+        Occupancy([Robot(RobotColor.RED, 0, 0), Robot(RobotColor.BLUE, 0, 0)])
@@ -0,0 +1,65 @@
+import pathlib
+
+import pytest
+import yaml
+
+from src import compiled_board
+from src.compiled_board import CompiledBoard, load_compiled_board
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _fail_safe_load(*args: object, **kwargs: object) -> None:
+    raise AssertionError("board.yaml was parsed")
+
+
+def test_round_trip_through_bytes():
+    with open(CONFIG_PATH) as f:
+        compiled = CompiledBoard.from_config(yaml.safe_load(f))
+    loaded = CompiledBoard.from_bytes(compiled.to_bytes())
+    assert (loaded.width, loaded.height) == (16, 16)
+    assert loaded.wall_color == compiled.wall_color
+    assert loaded.target_coordinates == compiled.target_coordinates
+    assert loaded.walls == compiled.walls
+    assert loaded.stops == compiled.stops
+    assert loaded.robot_count == compiled.robot_count == 4
+
+
+def test_robot_count_is_read_and_checked():
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    config["robot_count"] = 8
+    compiled = CompiledBoard.from_bytes(CompiledBoard.from_config(config).to_bytes())
+    assert compiled.robot_count == 8
+    config["robot_count"] = 9
+    with pytest.raises(ValueError):
+        CompiledBoard.from_config(config)
+    # Fewer robots than target colours would leave goals without a robot
+    config["robot_count"] = 2
+    with pytest.raises(ValueError, match="between 4 and 8"):
+        CompiledBoard.from_config(config)
+
+
+def test_cache_file_is_reused_until_yaml_changes(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    config_path = tmp_path / "board.yaml"
+    config_path.write_bytes(CONFIG_PATH.read_bytes())
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(compiled_board, "_compiled_boards", {})
+    first = load_compiled_board(config_path, cache_dir)
+    assert len(list(cache_dir.glob("board-*.bin"))) == 1
+
+    # A new process only has the file cache
+    monkeypatch.setattr(compiled_board, "_compiled_boards", {})
+    monkeypatch.setattr(yaml, "safe_load", _fail_safe_load)
+    second = load_compiled_board(config_path, cache_dir)
+    assert second.stops == first.stops
+
+    monkeypatch.undo()
+    monkeypatch.setattr(compiled_board, "_compiled_boards", {})
+    config_path.write_text(
+        CONFIG_PATH.read_text().replace('(3, 0): "S"', '(3, 0): "SE"')
+    )
+    changed = load_compiled_board(config_path, cache_dir)
+    assert changed.walls != first.walls
+    assert len(list(cache_dir.glob("board-*.bin"))) == 2
@@ -0,0 +1,136 @@
+import os
+import pathlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from src.common import Direction
+from src.game import Game
+from src.scenario import Scenario
+from src.solver import Solution
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+class StubSolver:
+    """BackgroundSolver that answers when the test says so"""
+
+    def __init__(self) -> None:
+        self.requests: list[Scenario] = []
+        self._answer: Solution | None = None
+
+    @property
+    def pending(self) -> bool:
+        return self._answer is None
+
+    def submit(self, scenario: Scenario) -> None:
+        self.requests.append(scenario)
+        self._answer = None
+
+    def answer(self, moves: list) -> None:
+        self._answer = Solution(moves=moves)
+
+    def poll(self) -> Solution | None:
+        answer, self._answer = self._answer, None
+        return answer
+
+    def close(self) -> None:
+        pass
+
+
+def _move_any_robot(game: Game) -> None:
+    """Makes a move that changes the position of the selected robot"""
+    for direction in Direction:
+        before = game.robots[0].get_position()
+        game._move_selected_robot(direction)
+        if game.robots[0].get_position() != before:
+            return
+    raise AssertionError("Robot 0 cannot move")
+
+
+def test_round_optimum_comes_from_the_starting_positions():
+    game = Game(CONFIG_PATH)
+    solver = StubSolver()
+    game.background_solver = solver  # type: ignore[assignment]
+    game._start_solving()
+    start = dict(game.initial_robot_positions)
+    assert solver.requests[0].robot_starts == start
+
+    # Moving before the round is solved does not supersede its request
+    _move_any_robot(game)
+    assert len(solver.requests) == 1 and game.hint_moves is None
+
+    round_moves = [(1, "UP")] * 7
+    solver.answer(round_moves)
+    game._poll_solver()
+    assert game.optimal_move_count == 7
+    assert game.round_solution == round_moves
+    # ...and the hint is then solved from where the robots are now
+    assert len(solver.requests) == 2
+    assert solver.requests[1].robot_starts != start
+    assert game.hint_moves is None
+
+    # A reset restores the round's hint and drops the hint still in flight
+    game._handle_input([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r)])
+    assert game.hint_moves == round_moves
+    solver.answer([(1, "LEFT")] * 6)
+    game._poll_solver()
+    assert game.hint_moves == round_moves
+    assert game.optimal_move_count == 7
+
+    # Leaving the optimal path asks for a new hint, which is used
+    _move_any_robot(game)
+    hint = [(2, "DOWN")] * 3
+    solver.answer(hint)
+    game._poll_solver()
+    assert game.hint_moves == hint
+    assert game.optimal_move_count == 7
+
+
+def _run_counting_frames(
+    monkeypatch: pytest.MonkeyPatch, seconds: float, **options: object
+) -> int:
+    """Runs a game for seconds and returns how many frames it drew"""
+    monkeypatch.setattr("src.game.BackgroundSolver", lambda config_path: StubSolver())
+    game = Game(CONFIG_PATH, **options)  # type: ignore[arg-type]
+    frames = 0
+    draw = game._draw
+
+    def counting_draw() -> None:
+        nonlocal frames
+        frames += 1
+        draw()
+
+    monkeypatch.setattr(game, "_draw", counting_draw)
+    pygame.init()
+    try:
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+        game.run()
+    finally:
+        pygame.quit()
+    return frames
+
+
+def test_idle_game_only_draws_when_something_changes(monkeypatch: pytest.MonkeyPatch):
+    # The first frame, and the one after the QUIT event
+    assert _run_counting_frames(monkeypatch, 0.5) <= 2
+    # Without idling every frame is drawn, at no more than max_fps
+    frames = _run_counting_frames(monkeypatch, 0.5, idle=False, max_fps=20)
+    assert 3 <= frames <= 12
+
+
+def test_idle_wait_returns_posted_events(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("src.game.IDLE_TIMEOUT_MS", 50)
+    game = Game(CONFIG_PATH)
+    pygame.init()
+    try:
+        pygame.display.set_mode((100, 100))
+        pygame.event.get()
+        assert game._wait_for_events() == []
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_h))
+        events = game._wait_for_events()
+        assert [event.type for event in events] == [pygame.KEYDOWN]
+    finally:
+        pygame.quit()
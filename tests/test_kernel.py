@@ -0,0 +1,66 @@
+import pathlib
+import random
+
+from src.board import Board
+from src.common import RobotColor
+from src.kernel import DIRECTIONS, MoveKernel
+from src.robots import Robot
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def test_pack_round_trip():
+    kernel = MoveKernel.from_board(Board(CONFIG_PATH))
+    positions = [(0, 0), (15, 15), (3, 9), (8, 1)]
+    state = kernel.pack(positions)
+    assert kernel.cell_bits == 8
+    assert state < 1 << 32
+    assert kernel.unpack(state, 4) == positions
+    assert kernel.position(state, 1) == 255
+
+
+def test_boards_sharing_tables_share_a_kernel():
+    kernel = MoveKernel.from_board(Board(CONFIG_PATH))
+    assert MoveKernel.from_board(Board(CONFIG_PATH)) is kernel
+
+
+def test_move_matches_robot_move():
+    board = Board(CONFIG_PATH)
+    kernel = MoveKernel.from_board(board)
+    rng = random.Random(1)
+    cells = [(r, c) for r in range(board.height) for c in range(board.width)]
+    for _ in range(200):
+        positions = rng.sample(cells, 4)
+        state = kernel.pack(positions)
+        occupied = kernel.occupied(state, 4)
+        for robot_idx in range(4):
+            for direction_idx, direction in enumerate(DIRECTIONS):
+                robots = [
+                    Robot(color, row, col)
+                    for color, (row, col) in zip(RobotColor, positions)
+                ]
+                robots[robot_idx].move(direction, board, robots)
+                expected = [robot.get_position() for robot in robots]
+                new_state = kernel.move(state, robot_idx, direction_idx, occupied)
+                assert kernel.unpack(new_state, 4) == expected
+
+
+def test_canonical_ignores_order_of_other_robots():
+    kernel = MoveKernel.from_board(Board(CONFIG_PATH))
+    a = kernel.pack([(1, 1), (2, 2), (3, 3), (4, 4)])
+    b = kernel.pack([(1, 1), (4, 4), (2, 2), (3, 3)])
+    c = kernel.pack([(2, 2), (1, 1), (3, 3), (4, 4)])
+    assert kernel.canonical(a, 0, 4) == kernel.canonical(b, 0, 4)
+    assert kernel.canonical(a, 0, 4) != kernel.canonical(c, 0, 4)
+
+
+def test_distances_never_overestimate_single_robot_moves():
+    kernel = MoveKernel.from_board(Board(CONFIG_PATH))
+    target = kernel.cell_index(6, 1)
+    distances = kernel.distances_to(target)
+    assert distances[target] == 0
+    # Real moves of a lone robot can only take at least as many steps
+    for cell in range(kernel.cell_count):
+        for direction_idx in range(len(DIRECTIONS)):
+            new_cell = kernel.move(cell, 0, direction_idx, 1 << cell)
+            assert distances[cell] <= distances[new_cell] + 1
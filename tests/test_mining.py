@@ -0,0 +1,36 @@
+import json
+import pathlib
+
+from src.mining import mine, resume_point
+from src.solver import SearchMode
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _read(path: pathlib.Path) -> list[dict]:
+    """The records of a mining output file, without their solve times"""
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    for record in records:
+        record.pop("solve_time", None)
+    return records
+
+
+def test_mining_streams_hard_puzzles_and_resumes(tmp_path: pathlib.Path):
+    path = tmp_path / "mined.jsonl"
+    records = list(mine(CONFIG_PATH, path, range(2, 4), 7, SearchMode.IDA_STAR))
+    assert records and all(r["optimal_moves"] >= 7 for r in records)
+    assert [r["seed"] for r in records] == sorted(r["seed"] for r in records)
+    complete = path.read_text()
+    mined = _read(path)
+    assert mined[-1] == {"checkpoint": 3}
+
+    # A crash while writing seed 3 leaves its records without a checkpoint
+    seed_2 = complete[: complete.index('{"checkpoint": 2}\n') + 18]
+    path.write_text(seed_2 + complete[len(seed_2) : -30])
+    assert resume_point(path) == 2
+    assert path.read_text() == seed_2
+    resumed = list(mine(CONFIG_PATH, path, range(2, 4), 7, SearchMode.IDA_STAR))
+    assert [r["target"] for r in resumed] == [
+        r["target"] for r in records if r["seed"] == 3
+    ]
+    assert _read(path) == mined
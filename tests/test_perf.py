@@ -0,0 +1,46 @@
+import pathlib
+
+import pytest
+
+from bench_suite import macro_benchmarks
+from src import perf
+from src.solver import SearchMode
+
+
+def test_summarize_reports_median_and_percentiles():
+    summary = perf.summarize([float(i) for i in range(1, 11)])
+    assert summary["median"] == 5.5
+    assert summary["min"] == 1.0 and summary["max"] == 10.0
+    assert summary["p10"] == pytest.approx(1.9)
+    assert summary["p90"] == pytest.approx(9.1)
+    assert perf.percentile([3.0], 99) == 3.0
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path: pathlib.Path):
+    path = tmp_path / "baseline.json"
+    perf.save_results(
+        path,
+        {
+            "fast": perf.summarize([1.0, 1.0]),
+            "slow": perf.summarize([1.0, 1.0]),
+            "removed": perf.summarize([1.0]),
+        },
+    )
+    current = {
+        "fast": perf.summarize([1.2]),
+        "slow": perf.summarize([1.5]),
+        "added": perf.summarize([9.0]),
+    }
+    changes, regressions = perf.compare(perf.load_results(path), current, 0.25)
+    assert [change.name for change in changes] == ["fast", "slow"]
+    assert [change.name for change in regressions] == ["slow"]
+
+    table = perf.format_comparison(changes, 0.25).splitlines()
+    assert "REGRESSION" not in table[1] and "+20.0%" in table[1]
+    assert table[2].endswith("+50.0%  REGRESSION")
+
+
+def test_macro_benchmarks_report_wrong_solution_lengths():
+    results, errors = macro_benchmarks([{"seed": 0, "moves": 99}], SearchMode.BFS, 1)
+    assert list(results) == ["solve/BFS/seed_0"]
+    assert errors == ["seed 0: expected 99 moves, found 3"]
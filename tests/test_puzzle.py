@@ -0,0 +1,38 @@
+import pathlib
+import random
+import subprocess
+import sys
+
+from src.common import TARGET_ROBOT_COLORS
+from src.puzzle import Puzzle
+
+ROOT = pathlib.Path(__file__).parent.parent
+CONFIG_PATH = ROOT / "board.yaml"
+
+
+def test_headless_modules_do_not_import_pygame():
+    code = (
+        "import sys, src.puzzle, src.solver; "
+        "assert 'pygame' not in sys.modules, 'pygame imported'"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_puzzle_places_robots_and_goal():
+    random.seed(0)
+    puzzle = Puzzle(config_path=CONFIG_PATH)
+    positions = [robot.get_position() for robot in puzzle.robots]
+    assert len(set(positions)) == 4
+    assert puzzle.target_robot.color == TARGET_ROBOT_COLORS[puzzle.goal_target]
+    assert puzzle.target_cell_coords == puzzle.board.get_target_coords(
+        puzzle.goal_target
+    )
+
+
+def test_reset_robots():
+    random.seed(0)
+    puzzle = Puzzle(config_path=CONFIG_PATH)
+    before = [robot.get_position() for robot in puzzle.robots]
+    puzzle.robots[0].row, puzzle.robots[0].col = puzzle.target_cell_coords
+    puzzle.reset_robots()
+    assert [robot.get_position() for robot in puzzle.robots] == before
@@ -0,0 +1,60 @@
+import pathlib
+import random
+
+import yaml
+
+from src.board import Board
+from src.common import RobotColor
+from src.puzzle import Puzzle
+from src.scenario import Scenario, central_cells
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def test_from_seed_matches_global_random_puzzle():
+    board = Board(CONFIG_PATH)
+    for seed in range(5):
+        random.seed(seed)
+        legacy = Puzzle(config_path=CONFIG_PATH)
+        scenario = Scenario.from_seed(board, seed)
+        puzzle = Puzzle(board=board, scenario=scenario)
+        assert puzzle.goal_target == legacy.goal_target
+        assert puzzle.target_cell_coords == legacy.target_cell_coords
+        assert puzzle.initial_robot_positions == legacy.initial_robot_positions
+        assert scenario.target_coords == legacy.board._target_lookup
+
+
+def test_from_seed_leaves_global_random_alone():
+    board = Board(CONFIG_PATH)
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    Scenario.from_seed(board, 7)
+    assert random.random() == expected
+
+
+def test_apply_replaces_targets_on_shared_board():
+    board = Board(CONFIG_PATH)
+    first = Scenario.from_seed(board, 0)
+    second = Scenario.from_seed(board, 1)
+    first.apply(board)
+    second.apply(board)
+    placed = [
+        cell.target for row in board.grid for cell in row if cell.target is not None
+    ]
+    assert len(placed) == len(second.target_coords)
+    for target, (row, col) in second.target_coords.items():
+        assert board.grid[row][col].target == target
+
+
+def test_robot_count_and_centre_follow_the_board(tmp_path: pathlib.Path):
+    assert central_cells(16, 16) == {(7, 7), (7, 8), (8, 7), (8, 8)}
+    assert central_cells(5, 5) == {(2, 2)}
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    config["robot_count"] = 6
+    config_path = tmp_path / "six.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    board = Board(config_path, cache_dir=tmp_path)
+    scenario = Scenario.from_seed(board, 0)
+    assert list(scenario.robot_starts) == list(RobotColor)[:6]
+    assert not central_cells(16, 16) & set(scenario.robot_starts.values())
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import pathlib
+
+from src.board import Board
+from src.puzzle import Puzzle
+from src.scenario import Scenario
+from src.service import SolverService
+from src.solver import Solver
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _request(request_id: int, puzzle: Puzzle) -> dict:
+    return {
+        "id": request_id,
+        "robots": [robot.get_position() for robot in puzzle.robots],
+        "goal": puzzle.goal_target.value,
+        "goal_cell": puzzle.target_cell_coords,
+    }
+
+
+async def _exchange(path: pathlib.Path, requests: list[dict]) -> list[dict]:
+    """Sends every request on one connection and reads as many responses"""
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    return responses
+
+
+def test_service_dedupes_caches_and_reports_metrics(tmp_path: pathlib.Path):
+    board = Board(config_path=CONFIG_PATH)
+    puzzles = [
+        Puzzle(board=board, scenario=Scenario.from_seed(board, seed))
+        for seed in range(3)
+    ]
+    expected = [len(Solver(puzzle).solve().moves) for puzzle in puzzles]
+    path = tmp_path / "solver.sock"
+
+    async def run() -> tuple[list[dict], list[dict], list[dict]]:
+        service = SolverService(board, workers=2)
+        try:
+            async with await service.start_unix_server(str(path)):
+                # Two clients ask for the same puzzles at once
+                requests = [_request(i, p) for i, p in enumerate(puzzles)]
+                first, second = await asyncio.gather(
+                    _exchange(path, requests), _exchange(path, requests)
+                )
+                again = await _exchange(
+                    path,
+                    [
+                        _request(0, puzzles[0]),
+                        {"id": 1, "robots": [[0, 0]], "goal": "RED_CIRCLE"},
+                        {"id": 2, "metrics": True},
+                    ],
+                )
+                return first, second, again
+        finally:
+            service.close()
+
+    first, second, (cached, invalid, metrics) = asyncio.run(run())
+    for responses in (first, second):
+        by_id = {response["id"]: response for response in responses}
+        assert [len(by_id[i]["moves"]) for i in range(3)] == expected
+        assert all(response["status"] == "SOLVED" for response in responses)
+    assert cached["cached"] and len(cached["moves"]) == expected[0]
+    assert "error" in invalid
+    assert metrics["searches"] == 3
+    assert metrics["deduplicated"] + metrics["cache_hits"] == 4
+    assert metrics["requests"] == 8 and metrics["errors"] == 1
+    assert metrics["in_flight"] == 0 and metrics["latency"]["samples"] == 7
@@ -0,0 +1,89 @@
+import pathlib
+
+import pytest
+import yaml
+
+from src.board import Board
+from src.common import Direction
+from src.puzzle import Puzzle
+from src.scenario import Scenario
+from src.solution_cache import SolutionCache, board_symmetries
+from src.solver import Solver
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _open_board(tmp_path: pathlib.Path) -> Board:
+    """A board with only the outer walls, symmetric under all 8 transforms"""
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    config["walls"] = {}
+    config_path = tmp_path / "open.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return Board(config_path, cache_dir=tmp_path)
+
+
+def _cache_key(
+    puzzle: Puzzle,
+) -> tuple[list[tuple[int, int]], int, tuple[int, int]]:
+    robots = [robot.get_position() for robot in puzzle.robots]
+    return robots, puzzle.robots.index(puzzle.target_robot), puzzle.target_cell_coords
+
+
+def _fail_search() -> None:
+    raise AssertionError("Solver searched despite a cache hit")
+
+
+def test_repeated_solve_is_served_from_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    board = Board(CONFIG_PATH, cache_dir=tmp_path)
+    puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, 4))
+    with SolutionCache(tmp_path / "solutions.sqlite") as cache:
+        solved = Solver(puzzle, cache=cache).solve()
+        assert len(cache) == 1
+        solver = Solver(puzzle, cache=cache)
+        monkeypatch.setattr(solver, "_search", _fail_search)
+        assert solver.solve().moves == solved.moves
+
+
+def test_lru_limit(tmp_path: pathlib.Path):
+    board = Board(CONFIG_PATH, cache_dir=tmp_path)
+    with SolutionCache(tmp_path / "solutions.sqlite", max_entries=2) as cache:
+        for seed in range(4):
+            puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, seed))
+            Solver(puzzle, cache=cache).solve()
+        assert len(cache) == 2
+        # Storing a puzzle again replaces its entry without evicting another
+        solution = Solver(puzzle, cache=cache).solve()
+        cache.put(board.compiled, *_cache_key(puzzle), solution.moves)
+        assert len(cache) == 2
+    with SolutionCache(tmp_path / "solutions.sqlite", max_entries=2) as cache:
+        puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, 4))
+        Solver(puzzle, cache=cache).solve()
+        assert len(cache) == 2
+
+
+def test_mirrored_puzzle_shares_entry(tmp_path: pathlib.Path):
+    board = _open_board(tmp_path)
+    assert len(board_symmetries(board.compiled)) == 8
+    scenario = Scenario.from_seed(board, 1)
+
+    def mirror(coords: tuple[int, int]) -> tuple[int, int]:
+        return coords[0], board.width - 1 - coords[1]
+
+    mirrored = Scenario(
+        {target: mirror(c) for target, c in scenario.target_coords.items()},
+        {color: mirror(c) for color, c in scenario.robot_starts.items()},
+        scenario.goal_target,
+    )
+    with SolutionCache(tmp_path / "solutions.sqlite") as cache:
+        Solver(Puzzle(board=board, scenario=scenario), cache=cache).solve()
+        puzzle = Puzzle(board=board, scenario=mirrored)
+        solution = Solver(puzzle, cache=cache).solve()
+        assert len(cache) == 1
+
+    for robot_idx, direction_name in solution.moves:
+        puzzle.robots[robot_idx].move(
+            Direction[direction_name], puzzle.board, puzzle.robots
+        )
+    assert puzzle.is_goal_target_reached()
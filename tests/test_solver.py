@@ -0,0 +1,183 @@
+import pathlib
+import random
+import subprocess
+import sys
+import threading
+
+import pytest
+import yaml
+
+from src.board import Board
+from src.budget import SearchProgress, SolveStatus
+from src.common import Direction, RobotColor, Target
+from src.puzzle import Puzzle
+from src.scenario import ROBOT_ORDER, Scenario
+from src.solver import SearchMode, Solver
+
+ROOT = pathlib.Path(__file__).parent.parent
+CONFIG_PATH = ROOT / "board.yaml"
+
+
+def _make_puzzle(seed: int) -> Puzzle:
+    random.seed(seed)
+    return Puzzle(config_path=CONFIG_PATH)
+
+
+def _replay(puzzle: Puzzle, moves: list[tuple[int, str]]) -> bool:
+    for robot_idx, direction_name in moves:
+        puzzle.robots[robot_idx].move(
+            Direction[direction_name], puzzle.board, puzzle.robots
+        )
+    return puzzle.is_goal_target_reached()
+
+
+def test_solve_reaches_goal():
+    puzzle = _make_puzzle(0)
+    solution = Solver(puzzle).solve()
+    assert len(solution.moves) == 3
+    assert _replay(puzzle, solution.moves)
+
+
+def test_solve_does_not_move_puzzle_robots():
+    puzzle = _make_puzzle(2)
+    before = [robot.get_position() for robot in puzzle.robots]
+    solution = Solver(puzzle).solve()
+    assert len(solution.moves) == 5
+    assert [robot.get_position() for robot in puzzle.robots] == before
+
+
+def test_symmetry_keeps_optimal_length():
+    puzzle = _make_puzzle(4)
+    plain = Solver(puzzle).solve()
+    solver = Solver(puzzle, symmetry=True)
+    reduced = solver.solve()
+    assert len(reduced.moves) == len(plain.moves) == 6
+    assert _replay(puzzle, reduced.moves)
+
+
+def test_ida_star_matches_bfs_length():
+    for seed in (4, 13, 17):
+        puzzle = _make_puzzle(seed)
+        bfs = Solver(puzzle).solve()
+        ida = Solver(puzzle, mode=SearchMode.IDA_STAR).solve()
+        assert len(ida.moves) == len(bfs.moves)
+        assert _replay(puzzle, ida.moves)
+
+
+def test_solve_all_matches_single_target_solves():
+    puzzle = _make_puzzle(0)
+    solutions = Solver(puzzle).solve_all(max_depth=5)
+    assert puzzle.goal_target in solutions
+    for target, solution in solutions.items():
+        assert len(solution.moves) <= 5
+        puzzle.goal_target = target
+        puzzle.target_cell_coords = puzzle.board.get_target_coords(target)
+        assert len(Solver(puzzle).solve().moves) == len(solution.moves)
+
+
+def test_layered_spills_and_matches_bfs_length():
+    puzzle = _make_puzzle(4)
+    bfs = Solver(puzzle).solve()
+    layered = Solver(puzzle, mode=SearchMode.LAYERED, memory_limit=1024).solve()
+    assert len(layered.moves) == len(bfs.moves)
+    assert _replay(puzzle, layered.moves)
+
+
+def test_vectorized_matches_bfs_length():
+    pytest.importorskip("numpy")
+    for seed in (4, 13):
+        puzzle = _make_puzzle(seed)
+        bfs = Solver(puzzle).solve()
+        vectorized = Solver(puzzle, mode=SearchMode.VECTORIZED).solve()
+        assert len(vectorized.moves) == len(bfs.moves)
+        assert _replay(puzzle, vectorized.moves)
+
+
+def test_solver_import_does_not_load_numpy():
+    code = "import sys, src.solver; assert 'numpy' not in sys.modules, 'numpy imported'"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_depth_limit_reports_lower_bound():
+    puzzle = _make_puzzle(4)
+    for mode in (SearchMode.BFS, SearchMode.IDA_STAR, SearchMode.LAYERED):
+        limited = Solver(puzzle, mode=mode).solve(max_depth=5)
+        assert limited.status == SolveStatus.DEPTH_LIMIT
+        assert not limited.solved and limited.min_moves == 6
+        assert len(Solver(puzzle, mode=mode).solve(max_depth=6).moves) == 6
+
+
+def test_progress_node_limit_and_cancel():
+    puzzle = _make_puzzle(4)
+    progress: list[SearchProgress] = []
+    solution = Solver(puzzle).solve(max_nodes=2000, progress=progress.append)
+    assert solution.status == SolveStatus.NODE_LIMIT
+    assert [p.depth for p in progress] == list(range(1, len(progress) + 1))
+    assert progress[0] == SearchProgress(depth=1, frontier_size=1, visited=1)
+
+    cancel = threading.Event()
+    cancel.set()
+    for mode in (SearchMode.BFS, SearchMode.IDA_STAR, SearchMode.LAYERED):
+        solution = Solver(puzzle, mode=mode).solve(cancel=cancel)
+        assert solution.status == SolveStatus.CANCELLED
+
+
+def test_solution_reports_search_stats():
+    puzzle = _make_puzzle(4)
+    for mode in (SearchMode.IDA_STAR, SearchMode.LAYERED, SearchMode.BFS):
+        stats = Solver(puzzle, mode=mode).solve().stats
+        assert stats is not None
+        # IDA* starts at its heuristic's bound rather than at one move
+        assert 0 < len(stats.frontier_sizes) == len(stats.layer_times) <= 6
+        assert stats.nodes_generated >= stats.nodes_expanded > 0
+        assert 0 <= stats.duplicates < stats.nodes_generated
+        assert stats.visited > 0 and stats.elapsed > 0
+    assert stats.frontier_sizes == [1, 15, 106, 488, 1710, 5017]
+    assert stats.to_dict()["nodes_expanded"] == stats.nodes_expanded
+
+
+def _board_variant(tmp_path: pathlib.Path, **changes: object) -> Board:
+    config = yaml.safe_load(CONFIG_PATH.read_text())
+    config.update(changes)
+    config_path = tmp_path / "variant.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return Board(config_path, cache_dir=tmp_path)
+
+
+def test_more_robots_keep_modes_in_agreement(tmp_path: pathlib.Path):
+    board = _board_variant(tmp_path, robot_count=6)
+    puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, 4))
+    assert len(puzzle.robots) == 6
+    bfs = Solver(puzzle).solve()
+    for mode in (SearchMode.IDA_STAR, SearchMode.LAYERED):
+        assert len(Solver(puzzle, mode=mode).solve().moves) == len(bfs.moves)
+    assert _replay(puzzle, bfs.moves)
+
+
+def test_states_wider_than_64_bits_need_int_states(tmp_path: pathlib.Path):
+    board = _board_variant(tmp_path, width=64, height=64, walls={}, robot_count=8)
+    # On the open board the red robot needs two moves: LEFT, stopped by a robot
+    # at (0, 19), then DOWN onto the goal, stopped by a robot at (11, 20)
+    red, left_blocker, down_blocker, *others = sorted(
+        ROBOT_ORDER, key=lambda color: color != RobotColor.RED
+    )
+    starts = {color: (63, col) for col, color in enumerate(others)}
+    starts |= {red: (0, 40), left_blocker: (0, 19), down_blocker: (11, 20)}
+    scenario = Scenario({Target.RED_CIRCLE: (10, 20)}, starts, Target.RED_CIRCLE)
+    puzzle = Puzzle(board=board, scenario=scenario)
+    solver = Solver(puzzle)
+    assert solver.kernel.cell_bits * len(puzzle.robots) == 96
+    container = solver.robot_container
+    state = container.get_state()
+    assert len(state) == 8
+    container.robots[0].row += 1
+    container.apply_state(state)
+    assert container.get_state() == state
+    with pytest.raises(ValueError):
+        Solver(puzzle, mode=SearchMode.LAYERED).solve()
+    red_idx = puzzle.robots.index(puzzle.target_robot)
+    for mode in (SearchMode.BFS, SearchMode.IDA_STAR):
+        solution = Solver(puzzle, mode=mode).solve(max_depth=3)
+        assert solution.solved
+        assert solution.moves == [(red_idx, "LEFT"), (red_idx, "DOWN")]
+        assert _replay(Puzzle(board=board, scenario=scenario), solution.moves)
@@ -0,0 +1,86 @@
+import pathlib
+import random
+
+import pytest
+
+from src.board import Board
+from src.common import Direction
+from src.puzzle import Puzzle
+from src.scenario import Scenario
+from src.solver import Solver
+from src.verifier import Verdict, Verifier
+
+CONFIG_PATH = pathlib.Path(__file__).parent.parent / "board.yaml"
+
+
+def _replay(puzzle: Puzzle, moves: list) -> bool:
+    """Whether moves bring the target robot to the goal, moving the robots"""
+    for robot_idx, direction_name in moves:
+        puzzle.robots[robot_idx].move(
+            Direction[direction_name], puzzle.board, puzzle.occupancy
+        )
+    solved = puzzle.is_goal_target_reached()
+    puzzle.reset_robots()
+    return solved
+
+
+def test_verifier_checks_submissions_like_the_game(monkeypatch: pytest.MonkeyPatch):
+    # Replay the batch with NumPy (when installed) and compare with verify()
+    monkeypatch.setattr("src.verifier._VECTORIZE_MIN", 1)
+    board = Board(config_path=CONFIG_PATH)
+    puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, 3))
+    optimal = Solver(puzzle).solve().moves
+    verifier = Verifier(puzzle)
+    starts = [robot.get_position() for robot in puzzle.robots]
+    assert verifier.optimal_moves == len(optimal)
+
+    rng = random.Random(0)
+    directions = [direction.name for direction in Direction]
+    submissions = [
+        optimal,
+        [(0, "LEFT"), *optimal],
+        [(0, "SIDEWAYS")],
+        [(7, "UP")],
+        [],
+    ] + [
+        [(rng.randrange(4), rng.choice(directions)) for _ in range(rng.randrange(12))]
+        for _ in range(200)
+    ]
+    # Random walks that happen to pass through the goal end somewhere else
+    submissions += [optimal + walk for walk in submissions[5:100]]
+
+    verdicts = verifier.verify_many(submissions)
+    assert [robot.get_position() for robot in puzzle.robots] == starts
+    assert verdicts[:5] == [
+        Verdict(True, len(optimal), True),
+        Verdict(True, len(optimal) + 1, False),
+        Verdict(
+            False,
+            1,
+            None,
+            "Move 1 is not (robot index, direction name): (0, 'SIDEWAYS')",
+        ),
+        Verdict(False, 1, None, "Move 1 moves robot 7, which does not exist"),
+        Verdict(False, 0, None, "The target robot ends off the goal"),
+    ]
+    for moves, verdict in zip(submissions, verdicts, strict=True):
+        assert verifier.verify(moves) == verdict
+        if verdict.error is None or verdict.error.startswith("The target"):
+            assert verdict.valid == _replay(puzzle, moves)
+    # Moves that are not (int, name) pairs send the batch down the slow path
+    malformed = [*submissions, [(1.5, "UP")], [("UP",)]]
+    assert verifier.verify_many(malformed) == [
+        *verdicts,
+        *map(verifier.verify, malformed[-2:]),
+    ]
+
+
+def test_verifier_replays_without_numpy(monkeypatch: pytest.MonkeyPatch):
+    board = Board(config_path=CONFIG_PATH)
+    puzzle = Puzzle(board=board, scenario=Scenario.from_seed(board, 3))
+    moves = Solver(puzzle).solve().moves
+    verifier = Verifier(puzzle, optimal_moves=len(moves))
+    monkeypatch.setattr("src.verifier.np", None)
+    assert (
+        verifier.verify_many([moves] * 2000) == [Verdict(True, len(moves), True)] * 2000
+    )